@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Union
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets in seconds for the median of the runs; the benchmark fails when one is exceeded
+IMPORT_BUDGET = 0.25
+FIRST_EVAL_BUDGET = 0.35
+FIRST_WINDOW_BUDGET = 1.5
+
+# Modules that must not be imported by 'import engine' (they load on first use)
+DEFERRED_MODULES = ("sympy", "numpy", "matplotlib", "pytesseract", "PIL", "torch", "transformers")
+
+# Each probe prints the seconds elapsed from its first statement to the milestone
+FIRST_EVAL_PROBE = """
+import time
+start = time.perf_counter()
+from engine import CalculatorEngine
+engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+assert engine.evaluate_expression("2 + 3 * 4") == 14
+print(time.perf_counter() - start)
+"""
+FIRST_WINDOW_PROBE = """
+import sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from calculator import CalculatorApp
+app = QApplication(sys.argv)
+window = CalculatorApp()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+def _run(code: str, cwd: str, extra_args: List[str] = (), env: Union[dict, None] = None) -> subprocess.CompletedProcess:
+    env = dict(os.environ, **(env or {}))
+    env["PYTHONPATH"] = HERE + os.pathsep + env.get("PYTHONPATH", "")
+    return subprocess.run([sys.executable, *extra_args, "-c", code], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+def import_profile(cwd: str, module: str = "engine", top: int = 10) -> dict:
+    """Parses `python -X importtime -c 'import module'` into the total and the slowest imports (cumulative µs)."""
+    proc = _run(f"import {module}", cwd, ["-X", "importtime"])
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(cumulative)))
+    total = next(us for name, us in rows if name.strip() == module)
+    loaded = {name.strip().split(".")[0] for name, _ in rows}
+    # Direct children of the profiled module are indented by exactly three spaces
+    children = sorted((row for row in rows if row[0].startswith("   ") and not row[0].startswith("    ")),
+                      key=lambda row: -row[1])
+    return {"seconds": total / 1e6, "slowest": [(name.strip(), us / 1e6) for name, us in children[:top]],
+            "deferred_loaded": sorted(loaded.intersection(DEFERRED_MODULES))}
+
+def _probe(code: str, cwd: str, runs: int, env: Union[dict, None] = None) -> Union[float, None]:
+    samples = []
+    for _ in range(runs):
+        proc = _run(code, cwd, env=env)
+        if proc.returncode != 0:
+            if "No module named 'PyQt6'" in proc.stderr:
+                return None
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def measure(runs: int = 5, window: bool = True) -> Dict[str, object]:
+    """Measures cold-start milestones in fresh interpreters, run from a scratch directory."""
+    with tempfile.TemporaryDirectory() as cwd:
+        results = {"import_engine": import_profile(cwd)}
+        results["first_eval"] = _probe(FIRST_EVAL_PROBE, cwd, runs)
+        if window:
+            # The offscreen platform lets the window be created without a display
+            results["first_window"] = _probe(FIRST_WINDOW_PROBE, cwd, runs,
+                                             {"QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")})
+    return results
+
+def check(results: dict, budgets: Dict[str, float]) -> List[str]:
+    """Returns a message for every milestone over its budget and every heavy module loaded eagerly."""
+    failures = []
+    timings = {"import_engine": results["import_engine"]["seconds"], "first_eval": results["first_eval"],
+               "first_window": results.get("first_window")}
+    for name, seconds in timings.items():
+        if seconds is not None and seconds > budgets[name]:
+            failures.append(f"{name} took {seconds:.3f}s, budget {budgets[name]:.3f}s")
+    for module in results["import_engine"]["deferred_loaded"]:
+        failures.append(f"'import engine' loaded {module} eagerly")
+    return failures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start time and fail when it exceeds the budget.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="fresh interpreters per milestone (median is used)")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET)
+    parser.add_argument("--eval-budget", type=float, default=FIRST_EVAL_BUDGET)
+    parser.add_argument("--window-budget", type=float, default=FIRST_WINDOW_BUDGET)
+    parser.add_argument("--no-window", action="store_true", help="skip the GUI milestone")
+    parser.add_argument("--json", default=None, help="also write the measurements to this file")
+    args = parser.parse_args(argv)
+
+    results = measure(args.runs, window=not args.no_window)
+    budgets = {"import_engine": args.import_budget, "first_eval": args.eval_budget,
+               "first_window": args.window_budget}
+    print(f"import engine      {results['import_engine']['seconds']:.3f}s (budget {args.import_budget:.3f}s)")
+    for name, seconds in results["import_engine"]["slowest"]:
+        print(f"    {name:<28} {seconds:.3f}s")
+    print(f"time to first eval {results['first_eval']:.3f}s (budget {args.eval_budget:.3f}s)")
+    if "first_window" in results:
+        window = results["first_window"]
+        shown = "skipped (PyQt6 not installed)" if window is None else f"{window:.3f}s"
+        print(f"time to window     {shown} (budget {args.window_budget:.3f}s)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(dict(results, budgets=budgets), f, indent=2)
+
+    failures = check(results, budgets)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,19 @@ import os
 import sys
 import subprocess
 
+def build_command():
+    """PyInstaller command line; modules the engine imports by name are listed as hidden imports."""
+    from engine import LAZY_MODULES
+    return [
+        "pyinstaller",
+        "--noconsole",
+        "--name=AntigravityCalculator",
+        "--onefile",
+        "--exclude-module=PyQt5",
+        *[f"--hidden-import={module}" for module in LAZY_MODULES],
+        "calculator.py"
+    ]
+
 def build():
     print("Starting Antigravity Premium Calculator Build Process...")
     
@@ -18,14 +31,7 @@ def build():
     # --name: Name of the executable
     # --add-data: Include additional files (like icons or the history log if needed)
     
-    cmd = [
-        "pyinstaller",
-        "--noconsole",
-        "--name=AntigravityCalculator",
-        "--onefile",
-        "--exclude-module=PyQt5",
-        "calculator.py"
-    ]
+    cmd = build_command()
 
     print(f"Running command: {' '.join(cmd)}")
     subprocess.check_call(cmd)
@@ -1,13 +1,20 @@
+import multiprocessing
 import sys
-import numpy as np
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QPushButton, QLineEdit, 
-                             QLabel, QStackedWidget, QFrame, QFileDialog, QStatusBar)
-from PyQt6.QtCore import Qt, QSize
+                             QLabel, QStackedWidget, QFrame, QFileDialog, QStatusBar,
+                             QProgressBar)
+from PyQt6.QtCore import Qt, QSize, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QFont, QColor, QPalette
-from engine import CalculatorEngine
+from engine import CalculatorEngine, SymbolicCancelled
+import contextlib
 import datetime
-from brain import SimpleBrain
+from functools import partial
+
+# Number of history entries rendered in the side panel
+HISTORY_PAGE_SIZE = 200
+# Analysis fields shown after 'Analyze'; the integral is only computed when a report is exported
+ANALYZE_FIELDS = ("roots", "derivative", "bref", "plot_path")
 
 class PremiumButton(QPushButton):
     def __init__(self, text, color1="#3a3a3a", color2="#2a2a2a", text_color="white"):
@@ -36,11 +43,67 @@ class PremiumButton(QPushButton):
             }}
         """)
 
+class JobSignals(QObject):
+    finished = pyqtSignal(object, object)  # job, result
+    failed = pyqtSignal(object, str)  # job, error message
+    progress = pyqtSignal(object, int, int)  # job, steps done, total steps
+
+class EngineJob(QRunnable):
+    """Runs one slow engine call on the thread pool and reports back through queued signals.
+
+    The call runs inside `scope` (CalculatorEngine.cancellable), so cancel()
+    kills the symbolic subprocess it is waiting on. With reports_progress the
+    call also gets a progress= callback, which forwards updates and stops the
+    call at its next step once the job is cancelled.
+    """
+    def __init__(self, key, message, fn, *args, scope=None, reports_progress=False):
+        super().__init__()
+        self.setAutoDelete(False)  # The app keeps its own reference until the result is delivered
+        self.key = key
+        self.message = message
+        self.fn = fn
+        self.args = args
+        self.scope = scope
+        self.reports_progress = reports_progress
+        self.progress = None  # (done, total) once the call has reported
+        self.cancelled = False
+        self._stop = None
+        self.signals = JobSignals()
+
+    def cancel(self):
+        self.cancelled = True
+        stop = self._stop
+        if stop is not None:
+            stop()
+
+    def report_progress(self, done, total):
+        if self.cancelled:
+            raise SymbolicCancelled("cancelled")
+        self.signals.progress.emit(self, done, total)
+
+    def run(self):
+        if self.cancelled:
+            return
+        kwargs = {"progress": self.report_progress} if self.reports_progress else {}
+        try:
+            with self.scope() if self.scope else contextlib.nullcontext(lambda: None) as stop:
+                self._stop = stop
+                # Cancelled between the check above and the scope opening
+                if self.cancelled:
+                    stop()
+                result = self.fn(*self.args, **kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+        self.signals.finished.emit(self, result)
+
 class CalculatorApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.engine = CalculatorEngine()
         self.last_analysis = None
+        self.thread_pool = QThreadPool.globalInstance()
+        self.jobs = {}  # (action, input) -> EngineJob in flight
         self.initUI()
         self.update_history_ui() # Load persistent history
         from PyQt6.QtCore import QTimer
@@ -167,6 +230,28 @@ class CalculatorApp(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Tip: Use 'Analyze' for a deep dive into any function.")
 
+        self.job_progress = QProgressBar()
+        self.job_progress.setRange(0, 0)  # Busy indicator until a job reports progress
+        self.job_progress.setFixedSize(120, 12)
+        self.job_progress.setTextVisible(False)
+        self.job_progress.hide()
+        self.status_bar.addPermanentWidget(self.job_progress)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet("""
+            QPushButton {
+                background: rgba(255, 77, 77, 0.3);
+                color: #ff6666;
+                border-radius: 6px;
+                padding: 2px 8px;
+                font-size: 11px;
+            }
+            QPushButton:hover { background: rgba(255, 77, 77, 0.5); }
+        """)
+        self.cancel_btn.clicked.connect(self.cancel_jobs)
+        self.cancel_btn.hide()
+        self.status_bar.addPermanentWidget(self.cancel_btn)
+
         # Right Panel (History)
         self.history_container = QFrame()
         self.history_container.setStyleSheet("""
@@ -182,6 +267,22 @@ class CalculatorApp(QMainWindow):
         history_title.setStyleSheet("color: #00ffcc; font-weight: bold; font-size: 16px; margin-bottom: 10px;")
         history_layout.addWidget(history_title)
 
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("Search history...")
+        self.history_search.setClearButtonEnabled(True)
+        self.history_search.setStyleSheet("""
+            QLineEdit {
+                background: rgba(20, 20, 20, 0.6);
+                color: #ccc;
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 8px;
+                padding: 5px;
+                font-size: 12px;
+            }
+        """)
+        self.history_search.textChanged.connect(self.update_history_ui)
+        history_layout.addWidget(self.history_search)
+
         from PyQt6.QtWidgets import QListWidget
         self.history_list = QListWidget()
         self.history_list.setStyleSheet("""
@@ -245,7 +346,9 @@ class CalculatorApp(QMainWindow):
 
     def update_history_ui(self):
         self.history_list.clear()
-        for item in reversed(self.engine.history):
+        search = self.history_search.text().strip()
+        page = self.engine.query_history(contains=search or None, limit=HISTORY_PAGE_SIZE)
+        for item in page['items']:
             self.history_list.addItem(f"[{item['timestamp']}] {item['type']}: {item['expression']}")
 
     def show_welcome_overlay(self):
@@ -304,6 +407,73 @@ class CalculatorApp(QMainWindow):
             self.setMinimumSize(700, 600)
             self.adjustSize()
 
+    def start_job(self, action, payload, message, fn, on_done, reports_progress=False):
+        """Runs fn(payload) off the GUI thread; a click matching a job still in flight is ignored."""
+        key = (action, payload)
+        if key in self.jobs:
+            self.status_bar.showMessage(f"{action} is already running for this input...")
+            return
+        job = EngineJob(key, message, fn, payload, scope=self.engine.cancellable, reports_progress=reports_progress)
+        job.signals.finished.connect(lambda finished_job, result: self._job_finished(finished_job, result, on_done))
+        job.signals.failed.connect(self._job_failed)
+        job.signals.progress.connect(self._job_progress)
+        self.jobs[key] = job
+        self.thread_pool.start(job)
+        self._update_job_progress()
+
+    def _take_job(self, job):
+        """Removes a job that has reported back; returns False if it was cancelled or superseded."""
+        if self.jobs.get(job.key) is not job:
+            return False
+        del self.jobs[job.key]
+        return not job.cancelled
+
+    def _job_finished(self, job, result, on_done):
+        if not self._take_job(job):
+            return
+        on_done(result)
+        self.update_history_ui()
+        self._update_job_progress()
+
+    def _job_failed(self, job, error):
+        if not self._take_job(job):
+            return
+        self.result_label.setText(f"Error: {error}")
+        self.status_bar.showMessage(f"{job.key[0]} failed.")
+        self._update_job_progress()
+
+    def _job_progress(self, job, done, total):
+        if self.jobs.get(job.key) is job and not job.cancelled:
+            job.progress = (done, total)
+            self._update_job_progress()
+
+    def cancel_jobs(self):
+        """Drops queued jobs and stops running ones (their symbolic subprocess is killed)."""
+        for job in self.jobs.values():
+            self.thread_pool.tryTake(job)
+            job.cancel()
+        count = len(self.jobs)
+        self.jobs.clear()
+        self.result_label.setText("Cancelled.")
+        self._update_job_progress()
+        self.status_bar.showMessage(f"Cancelled {count} job(s).")
+
+    def _update_job_progress(self):
+        """Shows progress (or a busy indicator), the cancel button and the current job summary while work is in flight."""
+        busy = bool(self.jobs)
+        self.job_progress.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+        if busy:
+            latest = list(self.jobs.values())[-1]
+            if latest.progress:
+                done, total = latest.progress
+                self.job_progress.setRange(0, total)
+                self.job_progress.setValue(done)
+            else:
+                self.job_progress.setRange(0, 0)
+            suffix = f" ({len(self.jobs)} jobs running)" if len(self.jobs) > 1 else ""
+            self.status_bar.showMessage(latest.message + suffix)
+
     def on_button_click(self, char):
         if char == 'C':
             self.display.clear()
@@ -321,39 +491,18 @@ class CalculatorApp(QMainWindow):
             self.status_bar.showMessage(f"Evaluated: {expression}")
         elif char == 'Solve':
             equation = self.display.text()
-            self.status_bar.showMessage("Solving equation...")
-            QApplication.processEvents()
-            solutions = self.engine.solve_equation(equation)
-            self.result_label.setText(f"Solutions: {solutions}")
-            self.update_history_ui()
-            self.status_bar.showMessage("Equation solved.")
+            self.start_job('Solve', equation, "Solving equation...", self.engine.solve_equation, self.on_solved)
         elif char == 'Analyze':
             expr = self.display.text()
-            self.status_bar.showMessage("Analyzing function and generating plot...")
-            QApplication.processEvents()
-            analysis = self.engine.analyze_function(expr)
-            if "error" in analysis:
-                self.result_label.setText(f"Error: {analysis['error']}")
-                self.status_bar.showMessage("Analysis failed.")
-            else:
-                self.last_analysis = analysis
-                report = f"<b>Bref:</b> {analysis['bref']}<br><b>Roots:</b> {analysis['roots']}<br><b>Deriv:</b> {analysis['derivative']}"
-                self.result_label.setText(report)
-                self.update_history_ui()
-                self.status_bar.showMessage("Analysis complete. Plot opened.")
-                import os
-                if os.path.exists(analysis['plot_path']):
-                    os.startfile(analysis['plot_path'])
+            self.start_job('Analyze', expr, "Analyzing function and generating plot...",
+                           partial(self.engine.analyze_function, fields=ANALYZE_FIELDS), self.on_analyzed,
+                           reports_progress=True)
         elif char == 'Export':
             if self.last_analysis:
-                self.status_bar.showMessage("Exporting report...")
-                QApplication.processEvents()
+                analysis = self.last_analysis
                 filename = f"analysis_{int(datetime.datetime.now().timestamp())}.png"
-                path = self.engine.export_report(self.last_analysis, filename)
-                self.result_label.setText(f"Report exported to: {path}")
-                self.status_bar.showMessage(f"Report saved to {filename}")
-                import os
-                os.startfile(path)
+                self.start_job('Export', analysis['expression'], "Exporting report...",
+                               lambda _: self.engine.export_report(analysis, filename), self.on_exported)
             else:
                 self.result_label.setText("Analyze a function first to export!")
                 self.status_bar.showMessage("Tip: Click 'Analyze' before 'Export'.")
@@ -361,25 +510,15 @@ class CalculatorApp(QMainWindow):
             self.status_bar.showMessage("Select an image to scan...")
             file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.bmp)")
             if file_path:
-                self.status_bar.showMessage("Extracting text from image...")
-                QApplication.processEvents()
-                text = self.engine.extract_text_from_image(file_path)
-                self.display.setText(text)
-                self.result_label.setText("Text extracted from image.")
-                self.update_history_ui()
-                self.status_bar.showMessage("OCR complete.")
+                self.start_job('OCR', file_path, "Extracting text from image...",
+                               self.engine.extract_text_from_image, self.on_ocr_done)
             else:
                 self.status_bar.showMessage("OCR cancelled.")
         elif char == 'Guide':
             expr = self.display.text()
             if expr:
                 self.result_label.setText("AI is thinking...")
-                self.status_bar.showMessage("AI is generating a hint...")
-                QApplication.processEvents()
-                guidance = self.engine.get_ai_guidance(expr)
-                self.result_label.setText(f"<b>AI Guide:</b> {guidance}")
-                self.update_history_ui()
-                self.status_bar.showMessage("AI hint generated.")
+                self.start_job('Guide', expr, "AI is generating a hint...", self.engine.get_ai_guidance, self.on_guidance)
             else:
                 self.result_label.setText("Enter an expression for the AI to guide you!")
                 self.status_bar.showMessage("Tip: Type a function or equation first.")
@@ -393,6 +532,52 @@ class CalculatorApp(QMainWindow):
         else:
             self.display.setText(self.display.text() + char)
 
+    def on_solved(self, solutions):
+        if getattr(solutions, 'approximate', False):
+            self.result_label.setText(f"Solutions (approximate, {solutions.method}): {solutions}")
+        else:
+            self.result_label.setText(f"Solutions: {solutions}")
+        if getattr(solutions, 'method', None) == "numeric":
+            self.status_bar.showMessage("No symbolic solution in time; showing numeric roots.")
+        elif getattr(solutions, 'free_variables', None):
+            free = ", ".join(map(str, solutions.free_variables))
+            self.status_bar.showMessage(f"Underdetermined system (rank {solutions.rank}); free variables: {free}")
+        elif getattr(solutions, 'rank', None) is not None and not solutions:
+            self.status_bar.showMessage(f"Inconsistent system (rank {solutions.rank}); no solution.")
+        else:
+            self.status_bar.showMessage("Equation solved.")
+
+    def on_analyzed(self, analysis):
+        if "error" in analysis:
+            self.result_label.setText(f"Error: {analysis['error']}")
+            self.status_bar.showMessage("Analysis failed.")
+        else:
+            self.last_analysis = analysis
+            report = f"<b>Bref:</b> {analysis['bref']}<br><b>Roots:</b> {analysis['roots']}<br><b>Deriv:</b> {analysis['derivative']}"
+            if analysis['approximate']:
+                approximate = ", ".join(f"{field} ({method})" for field, method in analysis['methods'].items() if method != "symbolic")
+                report += f"<br><i>Approximate: {approximate}</i>"
+            self.result_label.setText(report)
+            self.status_bar.showMessage("Analysis complete. Plot opened.")
+            import os
+            if os.path.exists(analysis['plot_path']):
+                os.startfile(analysis['plot_path'])
+
+    def on_exported(self, path):
+        self.result_label.setText(f"Report exported to: {path}")
+        self.status_bar.showMessage(f"Report saved to {path}")
+        import os
+        os.startfile(path)
+
+    def on_ocr_done(self, text):
+        self.display.setText(text)
+        self.result_label.setText("Text extracted from image.")
+        self.status_bar.showMessage("OCR complete.")
+
+    def on_guidance(self, guidance):
+        self.result_label.setText(f"<b>AI Guide:</b> {guidance}")
+        self.status_bar.showMessage("AI hint generated.")
+
     def resizeEvent(self, event):
         """Dynamic scaling of fonts based on window size."""
         super().resizeEvent(event)
@@ -444,7 +629,14 @@ class CalculatorApp(QMainWindow):
                 widget.setStyleSheet(new_style)
 
 if __name__ == "__main__":
+    # Must run first: in a frozen build, worker processes re-enter here and are dispatched by this call
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = CalculatorApp()
     window.show()
+    # Import SymPy/NumPy and load the hint model in the background once the window is up
+    # (--no-prewarm measures a cold first use)
+    if "--no-prewarm" not in sys.argv:
+        window.engine.prewarm()
+        window.engine.prewarm_ai()
     sys.exit(app.exec())
@@ -0,0 +1,166 @@
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, TextIO, Tuple, Union
+
+COMMANDS = ("auto", "eval", "solve", "analyze")
+# Analysis fields written by default; the plot fields would pull in matplotlib
+DEFAULT_ANALYZE_FIELDS = ("roots", "derivative", "integral", "bref")
+
+_engine = None
+
+def _get_engine(engine_kwargs: Union[dict, None] = None):
+    """Returns this process's engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        from engine import CalculatorEngine
+        _engine = CalculatorEngine(**(engine_kwargs or {}))
+    return _engine
+
+def _init_worker(engine_kwargs: dict):
+    _get_engine(engine_kwargs)
+
+def to_json(value):
+    """Converts engine results (SymPy objects, NumPy arrays, complex numbers, SolveResult) to JSON-ready values."""
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, float):
+        return value if value == value and abs(value) != float("inf") else str(value)
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, complex) or not hasattr(value, "tolist"):
+        return str(value)
+    return to_json(value.tolist())
+
+def _command_for(line: str, command: str) -> str:
+    if command != "auto":
+        return command
+    from engine import EQUALS_SIGN
+    return "solve" if EQUALS_SIGN.search(line) or ";" in line else "eval"
+
+def process_line(line: str, command: str, fields: Tuple[str, ...], timeout: Union[float, None]) -> dict:
+    """Runs one input line through the engine and returns its JSON record (without the line number)."""
+    engine = _get_engine()
+    command = _command_for(line, command)
+    record = {"input": line, "command": command}
+    if command == "eval":
+        result = engine.evaluate_expression(line)
+        if isinstance(result, str) and result.startswith("Error"):
+            record["error"] = result
+        else:
+            record["result"] = to_json(result)
+    elif command == "solve":
+        result = engine.solve_equation(line, timeout=timeout)
+        if len(result) == 1 and isinstance(result[0], str):
+            record["error"] = result[0]
+        else:
+            record["result"] = to_json(list(result))
+            record["method"] = getattr(result, "method", None)
+            record["approximate"] = getattr(result, "approximate", False)
+    else:
+        analysis = engine.analyze_function(line, timeout=timeout, fields=fields)
+        if "error" in analysis:
+            record["error"] = analysis["error"]
+        else:
+            record["result"] = {field: to_json(analysis[field]) for field in fields}
+            record["approximate"] = analysis["approximate"]
+    return record
+
+def _process_batch(batch: List[Tuple[int, str]], command: str, fields: Tuple[str, ...],
+                   timeout: Union[float, None]) -> List[dict]:
+    records = []
+    for number, line in batch:
+        try:
+            record = process_line(line, command, fields, timeout)
+        except Exception as e:
+            record = {"input": line, "command": command, "error": f"Error: {e}"}
+        records.append({"line": number, **record})
+    return records
+
+def read_inputs(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """Yields (line_number, text) for every non-blank, non-comment input line."""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield number, line
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def run_pipeline(inputs: Iterable[Tuple[int, str]], command: str = "auto",
+                 fields: Tuple[str, ...] = DEFAULT_ANALYZE_FIELDS, workers: int = 1, batch_size: int = 32,
+                 timeout: Union[float, None] = None, engine_kwargs: Union[dict, None] = None) -> Iterator[dict]:
+    """Yields one result record per input, in input order.
+
+    With workers > 1 batches go to a process pool, but at most 2 * workers
+    batches are in flight, so memory stays bounded on unbounded input.
+    """
+    engine_kwargs = engine_kwargs or {}
+    batches = _batches(inputs, batch_size)
+    if workers <= 1:
+        _get_engine(engine_kwargs)
+        for batch in batches:
+            yield from _process_batch(batch, command, fields, timeout)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine_kwargs,)) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_process_batch, batch, command, fields, timeout))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate, solve or analyze expressions line by line, writing JSONL.")
+    parser.add_argument("command", nargs="?", choices=COMMANDS, default="auto",
+                        help="auto solves lines containing '=' or ';' and evaluates the rest")
+    parser.add_argument("-i", "--input", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes; output order is preserved")
+    parser.add_argument("--batch-size", type=int, default=32, help="lines sent to a worker at a time")
+    parser.add_argument("--timeout", type=float, default=None, help="symbolic budget per operation in seconds")
+    parser.add_argument("--fields", default=",".join(DEFAULT_ANALYZE_FIELDS), help="comma-separated analysis fields")
+    parser.add_argument("--history", default=None, help="record history to this JSONL file (off by default)")
+    parser.add_argument("--quiet", action="store_true", help="do not print the throughput summary")
+    args = parser.parse_args(argv)
+
+    # The CLI never hints or runs OCR, so those caches stay closed
+    engine_kwargs = {"record_history": args.history is not None, "history_file": args.history,
+                     "hint_cache_file": None, "ocr_cache_file": None}
+    fields = tuple(field.strip() for field in args.fields.split(",") if field.strip())
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = failures = 0
+    start = time.perf_counter()
+    try:
+        for record in run_pipeline(read_inputs(source), args.command, fields, args.workers,
+                                   args.batch_size, args.timeout, engine_kwargs):
+            count += 1
+            failures += "error" in record
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = count / elapsed if elapsed else 0.0
+        print(f"{count} lines, {failures} errors in {elapsed:.2f}s ({rate:.1f} lines/s, {args.workers} worker(s))",
+              file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+import importlib
+import multiprocessing
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union
+
+# Seconds a new worker may take to start (and preload) before calls fall back to running inline
+START_TIMEOUT = 20.0
+
+class SymbolicTimeout(Exception):
+    """Raised when a symbolic operation exceeds its time budget."""
+
+class SymbolicCancelled(Exception):
+    """Raised when a symbolic operation is cancelled from another thread."""
+
+def _worker_main(conn, preload: tuple):
+    """Serves (fn, args) requests until the parent closes the pipe or kills the process."""
+    for module in preload:
+        importlib.import_module(module)
+    conn.send(("ready", None))
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ("ok", fn(*args))
+        except Exception as e:
+            reply = ("error", e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Unpicklable results or exceptions are reported as plain text
+            conn.send(("error", RuntimeError(str(e))))
+
+def _default_context():
+    # fork never re-imports __main__, so scripts without a __main__ guard and frozen apps work.
+    # Elsewhere fork is unsafe (macOS system frameworks) or unavailable (Windows).
+    return multiprocessing.get_context("fork" if sys.platform.startswith("linux") else "spawn")
+
+class _Worker:
+    def __init__(self, ctx, preload: tuple, start_timeout: float = START_TIMEOUT):
+        if ctx.get_start_method() == "fork":
+            # A forked child flushes the inherited std stream buffers when it exits
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, preload), daemon=True)
+        self.process.start()
+        child_conn.close()
+        # Start-up (including preloaded imports) is not charged to any call's deadline
+        try:
+            if not self.conn.poll(start_timeout):
+                raise RuntimeError(f"symbolic worker did not start within {start_timeout}s")
+            self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise RuntimeError(f"symbolic worker failed to start: {e or 'exited during start-up'}")
+        except RuntimeError:
+            self.kill()
+            raise
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+class DeadlinePool:
+    """Runs callables in reusable subprocesses that are killed when they overrun their deadline.
+
+    Idle workers are kept for reuse, so only the first call (and the first call
+    after a timeout) pays the process start-up cost. Concurrent callers each get
+    their own worker. Workers are forked on Linux and spawned elsewhere. If a
+    worker cannot start within `start_timeout` (e.g. a spawned child of a
+    script without a __main__ guard, or of a frozen app that never called
+    multiprocessing.freeze_support()), the pool records `start_error` and runs
+    every later call inline, without a deadline. Calls made inside
+    cancellable() can be stopped from another thread.
+    """
+    def __init__(self, max_idle: int = 2, preload: Iterable[str] = (), start_timeout: float = START_TIMEOUT,
+                 context=None):
+        self.max_idle = max_idle
+        self.preload = tuple(preload)
+        self.start_timeout = start_timeout
+        self.start_error = None
+        self._ctx = context or _default_context()
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        # Per thread: the cancel flag of its open cancellable() scope and the worker serving its call
+        self._scopes: Dict[int, threading.Event] = {}
+        self._running: Dict[int, _Worker] = {}
+
+    @contextmanager
+    def cancellable(self) -> Iterator[Callable[[], None]]:
+        """Scopes this thread's calls and yields a cancel function that any thread may call.
+
+        Cancelling kills the worker serving the call in flight, which then raises
+        SymbolicCancelled, as does every later call in the scope. Calls that run
+        inline (no timeout, or no worker could start) are not interrupted.
+        """
+        ident = threading.get_ident()
+        flag = threading.Event()
+
+        def cancel():
+            with self._lock:
+                flag.set()
+                worker = self._running.get(ident) if self._scopes.get(ident) is flag else None
+            if worker is not None:
+                worker.process.kill()
+
+        with self._lock:
+            outer = self._scopes.get(ident)
+            self._scopes[ident] = flag
+        try:
+            yield cancel
+        finally:
+            with self._lock:
+                if outer is None:
+                    del self._scopes[ident]
+                else:
+                    self._scopes[ident] = outer
+
+    def call(self, fn: Callable, args: tuple, timeout: Union[float, None]) -> Any:
+        """Returns fn(*args), raising SymbolicTimeout after `timeout` seconds (None runs inline)."""
+        ident = threading.get_ident()
+        flag = self._scopes.get(ident)
+        if flag is not None and flag.is_set():
+            raise SymbolicCancelled(f"{getattr(fn, '__name__', fn)} was cancelled")
+        if timeout is None or self.start_error is not None:
+            return fn(*args)
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None or not worker.process.is_alive():
+            try:
+                worker = _Worker(self._ctx, self.preload, self.start_timeout)
+            except Exception as e:
+                self.start_error = str(e)
+                return fn(*args)
+        with self._lock:
+            self._running[ident] = worker
+            cancelled = flag is not None and flag.is_set()
+        try:
+            if cancelled:
+                worker.process.kill()
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(timeout):
+                worker.kill()
+                raise SymbolicTimeout(f"{getattr(fn, '__name__', fn)} exceeded {timeout}s")
+            status, value = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker.kill()
+            if flag is not None and flag.is_set():
+                raise SymbolicCancelled(f"{getattr(fn, '__name__', fn)} was cancelled")
+            raise RuntimeError(f"Symbolic worker died: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(ident, None)
+        with self._lock:
+            # A cancel that raced the reply may already have killed this worker
+            if len(self._idle) < self.max_idle and not (flag is not None and flag.is_set()):
+                self._idle.append(worker)
+                worker = None
+        if worker is not None:
+            worker.kill()
+        if status == "error":
+            raise value
+        return value
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
@@ -1,67 +1,339 @@
+from __future__ import annotations
 import math
-import json
 import os
-import numpy as np
-import matplotlib.pyplot as plt
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application, convert_xor
-import pytesseract
-from PIL import Image
-from typing import Union, List, Tuple
+import queue
+import re
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Hashable, Iterable, Iterator, Union, List, Tuple
+from fast_eval import fast_evaluate, UnsupportedExpression
+from history_store import HistoryStore
+from deadline import DeadlinePool, SymbolicCancelled, SymbolicTimeout
+from symbolic_cache import SymbolicCache, default_cache_path
+from lazy_imports import lazy_import, prewarm
+from hint_model import DEFAULT_MODEL, HintModel
+
+# Heavy dependencies load on first use, so plain arithmetic never pays for them
+np = lazy_import("numpy")
+sp = lazy_import("sympy")
+sympy_parser = lazy_import("sympy.parsing.sympy_parser")
+plotting = lazy_import("plotting")
+roots = lazy_import("roots")
+quadrature = lazy_import("quadrature")
+linear_systems = lazy_import("linear_systems")
+matrix_ops = lazy_import("matrix_ops")
+sparse_matrix = lazy_import("sparse_matrix")
+ocr = lazy_import("ocr")
+
+# Modules imported by name (lazily or in worker preloads), which PyInstaller cannot discover;
+# build_app.py passes them as hidden imports
+LAZY_MODULES = ("numpy", "sympy", "sympy.parsing.sympy_parser", "plotting", "roots", "quadrature",
+                "linear_systems", "matrix_ops", "sparse_matrix", "ocr")
+# Modules prewarm() imports in the background, most commonly needed first
+PREWARM_MODULES = ("sympy", "sympy.parsing.sympy_parser", "numpy", "roots", "quadrature", "linear_systems")
+# The Scientific 'e' button means Euler's number when evaluating
+EULER_SYMBOL_NAME = 'e'
+# How evaluate_many/solve_many report items that fail
+BATCH_ERROR_POLICIES = ("return", "none", "raise")
+# Solver paths whose results are exact; anything else is marked approximate
+EXACT_METHODS = ("symbolic", "elimination")
+# Separators between the equations of a system passed as one string
+EQUATION_SEPARATOR = re.compile(r'[;\n]')
+# A single '=' (not part of ==, <=, >= or !=) splits an equation into sides
+EQUALS_SIGN = re.compile(r'(?<![<>!=])=(?!=)')
+# Fields analyze_function computes eagerly unless the caller asks for a subset
+ANALYSIS_FIELDS = ("roots", "derivative", "integral", "bref", "plot_path")
+# Recognized images buffered between the OCR and math stages of solve_images
+OCR_QUEUE_SIZE = 32
+# Size caps of the persistent hint cache (one short hint per expression)
+HINT_CACHE_ENTRIES = 5000
+HINT_CACHE_BYTES = 8 * 1024 * 1024
+# Size caps of the persistent OCR cache (a page of text per image)
+OCR_CACHE_ENTRIES = 20000
+OCR_CACHE_BYTES = 64 * 1024 * 1024
+
+def _transformations() -> tuple:
+    return sympy_parser.standard_transformations + (sympy_parser.implicit_multiplication_application,
+                                                    sympy_parser.convert_xor)
+
+def _splittable(name: str) -> bool:
+    # Subscripted unknowns (x1, v0, a12) stay whole; other names split as usual (xy -> x*y)
+    return not any(ch.isdigit() for ch in name) and sympy_parser._token_splittable(name)
+
+def _equation_transformations() -> tuple:
+    """Like _transformations, but names with digits are kept as symbols so systems can use x1, x2, ..."""
+    return sympy_parser.standard_transformations + (sympy_parser.split_symbols_custom(_splittable),
+                                                    sympy_parser.implicit_multiplication,
+                                                    sympy_parser.implicit_application,
+                                                    sympy_parser.function_exponentiation,
+                                                    sympy_parser.convert_xor)
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss/eviction counters."""
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+class SolveResult(list):
+    """List of solutions that also records which path produced it and, when known, root multiplicities.
+
+    Linear systems also record the coefficient rank and the free variables that
+    parametrize an underdetermined solution.
+    """
+    def __init__(self, solutions: Iterable = (), method: str = "symbolic", multiplicities: Union[List[int], None] = None,
+                 rank: Union[int, None] = None, free_variables: Union[List[sp.Symbol], None] = None):
+        super().__init__(solutions)
+        self.method = method
+        self.multiplicities = multiplicities
+        self.rank = rank
+        self.free_variables = free_variables
+
+    @property
+    def approximate(self) -> bool:
+        return self.method not in EXACT_METHODS
+
+class LazyAnalysis(Mapping):
+    """Function analysis whose fields are computed on first access and memoized.
+
+    Fields share intermediate results (bref reuses the roots), so no solve
+    runs twice. "methods" and "approximate"
+    describe only the fields computed so far. Errors raised while computing a
+    field propagate to the caller that accessed it.
+    """
+    FIELDS = ("expression", "roots", "derivative", "integral", "definite_integral", "bref",
+              "plot_image", "plot_png", "plot_path", "methods", "approximate")
+
+    def __init__(self, engine: "CalculatorEngine", expression: str, expr: sp.Expr,
+                 timeout: Union[float, None], x_range: Tuple[float, float], exact: Union[bool, None] = None,
+                 numeric: bool = False):
+        self.engine = engine
+        self.expr = expr
+        self.timeout = timeout
+        self.exact = exact
+        self.numeric = numeric
+        self.x_range = x_range
+        self._values = {"expression": expression}
+        self._methods = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, field: str):
+        if field == "methods":
+            return dict(self._methods)
+        if field == "approximate":
+            return any(method not in EXACT_METHODS for method in self._methods.values())
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        with self._lock:
+            if field not in self._values:
+                self._values[field] = getattr(self, f"_compute_{field}")()
+            return self._values[field]
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def computed(self, field: str) -> bool:
+        return field in self._values
+
+    def _compute_roots(self):
+        roots = self.engine._solve_for_x(self.expr, self.timeout, self.exact, self.numeric, self.x_range)
+        self._methods["roots"] = roots.method
+        return roots
+
+    def _compute_derivative(self):
+        derivative, self._methods["derivative"] = self.engine._differentiate(self.expr, self.timeout)
+        return derivative
+
+    def _compute_integral(self):
+        integral, self._methods["integral"] = self.engine._integrate(self.expr, self.timeout)
+        return integral
+
+    def _compute_definite_integral(self):
+        value, error = self.engine._numeric_integral(self.expr, self.x_range)
+        self._methods["definite_integral"] = "numeric"
+        return {"range": self.x_range, "value": value, "error": error, "method": "numeric"}
+
+    def _compute_bref(self):
+        return self.engine.get_bref_analysis(self.expr, roots=self["roots"])
+
+    def _compute_plot_image(self):
+        return self.engine.render_function(self["expression"], self.x_range, fmt="rgba")
+
+    def _compute_plot_png(self):
+        image = self["plot_image"]
+        return plotting.encode_png(image) if isinstance(image, np.ndarray) else image
+
+    def _compute_plot_path(self):
+        png = self["plot_png"]
+        if not isinstance(png, bytes):
+            return png
+        with open(self.engine.plot_path, 'wb') as f:
+            f.write(png)
+        return self.engine.plot_path
 
 class CalculatorEngine:
-    def __init__(self):
-        self.x = sp.Symbol('x')
-        self.history_file = "history_log.json"
-        self.history = self._load_history()
-        self.ai_model = None
-        self.ai_tokenizer = None
-
-    def _load_history(self):
-        """Loads history from a JSON file."""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
-
-    def _save_history(self):
-        """Saves history to a JSON file."""
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=4)
-        except:
-            pass
+    def __init__(self, parse_cache_size: int = 256, fast_path: bool = True, record_history: bool = True,
+                 history_file: Union[str, None] = "history_log.jsonl", history_limit: int = 10000,
+                 symbolic_timeout: Union[float, None] = 10.0, exact_roots: bool = False,
+                 compile_cache_size: int = 128,
+                 symbolic_cache_file: Union[str, None] = default_cache_path("symbolic_cache.sqlite"),
+                 ai_model_name: str = DEFAULT_MODEL, ai_quantize: bool = False, ai_threads: Union[int, None] = None,
+                 hint_cache_file: Union[str, None] = default_cache_path("hint_cache.sqlite"),
+                 ocr_cache_file: Union[str, None] = default_cache_path("ocr_cache.sqlite")):
+        self.history_file = history_file
+        self.record_history = record_history
+        self.history_store = HistoryStore(history_file, history_limit, legacy_path="history_log.json")
+        self.history = self.history_store.entries
+        self._history_buffer = None
+        # T5 hint generator; nothing is imported until the first hint or prewarm_ai()
+        self.hint_model = HintModel(ai_model_name, quantize=ai_quantize, num_threads=ai_threads)
+        # Persistent caches are opened on first use (see _open_cache), so engines that never
+        # hint, OCR or solve create no files
+        self._caches = {}
+        self._caches_lock = threading.Lock()
+        # Generated hints shared across sessions; None disables it
+        self.hint_cache_file = hint_cache_file
+        # Recognized text keyed by image content hash; None disables it
+        self.ocr_cache_file = ocr_cache_file
+        self.parse_cache = LRUCache(parse_cache_size)
+        self.compile_cache = LRUCache(compile_cache_size)
+        self.fast_path = fast_path
+        self.last_eval_tier = None
+        self.eval_tier_counts = {"fast": 0, "sympy": 0}
+        self.plot_path = os.path.join(tempfile.gettempdir(), "last_plot.png")
+        # Per-operation budget (seconds) for solve/diff/integrate; None runs them inline without a limit
+        self.symbolic_timeout = symbolic_timeout
+        self.deadline_pool = DeadlinePool(preload=("sympy",))
+        # Polynomials are solved numerically unless exact (radical/CRootOf) roots are requested
+        self.exact_roots = exact_roots
+        # solve/diff/integrate results shared across sessions and processes; None disables it
+        self.symbolic_cache_file = symbolic_cache_file
+
+    def _open_cache(self, name: str, path: Union[str, None], *limits) -> Union[SymbolicCache, None]:
+        """Returns the named persistent cache, opening it on first call; None when disabled or unopenable."""
+        with self._caches_lock:
+            if name not in self._caches:
+                try:
+                    self._caches[name] = SymbolicCache(path, *limits) if path else None
+                except Exception:
+                    self._caches[name] = None
+            return self._caches[name]
+
+    @property
+    def hint_cache(self) -> Union[SymbolicCache, None]:
+        return self._open_cache("hint", self.hint_cache_file, HINT_CACHE_ENTRIES, HINT_CACHE_BYTES)
+
+    @property
+    def ocr_cache(self) -> Union[SymbolicCache, None]:
+        return self._open_cache("ocr", self.ocr_cache_file, OCR_CACHE_ENTRIES, OCR_CACHE_BYTES)
+
+    @property
+    def symbolic_cache(self) -> Union[SymbolicCache, None]:
+        return self._open_cache("symbolic", self.symbolic_cache_file)
+
+    @property
+    def x(self) -> sp.Symbol:
+        return sp.Symbol('x')
+
+    def cancellable(self):
+        """Context manager yielding a function that stops this thread's symbolic work from any thread.
+
+        The subprocess running the current solve/diff/integrate is killed and it,
+        like every later symbolic step inside the block, raises SymbolicCancelled.
+        """
+        return self.deadline_pool.cancellable()
+
+    def prewarm(self, modules: Iterable[str] = PREWARM_MODULES) -> threading.Thread:
+        """Starts importing the heavy dependencies on a background thread, e.g. once the window is shown."""
+        return prewarm(modules)
 
     def _load_ai(self):
         """Loads the lightweight AI model if not already loaded with lazy imports."""
-        if self.ai_model is None:
-            try:
-                # Lazy imports to prevent startup crashes due to DLL errors
-                from transformers import T5ForConditionalGeneration, T5Tokenizer
-                import torch
-                
-                model_name = "google/t5-small"
-                self.ai_tokenizer = T5Tokenizer.from_pretrained(model_name)
-                self.ai_model = T5ForConditionalGeneration.from_pretrained(model_name)
-                self.ai_model.eval()
-                self.torch_module = torch # Store for later use
-            except Exception as e:
-                raise RuntimeError(f"AI Initialization Failed: {str(e)}")
+        self.hint_model.load()
+
+    def prewarm_ai(self) -> threading.Thread:
+        """Loads the hint model on a background thread so the first hint does not wait for it."""
+        return self.hint_model.preload()
 
     def _add_to_history(self, type: str, expression: str, result: any):
+        if not self.record_history:
+            return
         import datetime
-        self.history.append({
+        now = datetime.datetime.now()
+        self._extend_history([{
             "type": type,
             "expression": expression,
             "result": str(result),
-            "timestamp": datetime.datetime.now().strftime("%H:%M:%S")
-        })
-        if len(self.history) > 100:
-            self.history.pop(0)
-        self._save_history()
+            "timestamp": now.strftime("%H:%M:%S"),
+            "time": now.timestamp()
+        }])
+
+    def _extend_history(self, entries: List[dict]):
+        """Appends ready-made history entries to the store in one write."""
+        if self._history_buffer is not None:
+            self._history_buffer.extend(entries)
+        else:
+            self.history_store.extend(entries)
+
+    def query_history(self, type: Union[str, Iterable[str], None] = None, since=None, until=None,
+                      contains: Union[str, None] = None, prefix: Union[str, None] = None,
+                      cursor: Union[int, None] = None, limit: int = 50) -> dict:
+        """Searches history newest-first by type, time range (epoch seconds or datetime) and expression text.
+
+        Returns {"items": [...], "next_cursor": ...}; pass next_cursor back to fetch the following page.
+        """
+        if hasattr(since, "timestamp"):
+            since = since.timestamp()
+        if hasattr(until, "timestamp"):
+            until = until.timestamp()
+        return self.history_store.query(type, since, until, contains, prefix, cursor, limit)
 
     def _auto_close_parentheses(self, expression: str) -> str:
         """Automatically appends missing closing parentheses."""
@@ -88,110 +360,483 @@ class CalculatorEngine:
             expression = expression.replace(old, new)
         return expression
 
+    def _normalize(self, raw: str) -> str:
+        """Applies parenthesis auto-closing and symbol mapping to raw user input."""
+        return self._preprocess(self._auto_close_parentheses(raw))
+
+    def _parse(self, raw: str, subscripts: bool = False) -> Tuple[str, sp.Expr]:
+        """Normalizes and parses user input, returning (normalized_text, expr) memoized by the raw string.
+
+        subscripts=True keeps names such as x1 whole instead of splitting them into x*1.
+        """
+        key = ("subscripts", raw) if subscripts else raw
+        cached = self.parse_cache.get(key)
+        if cached is not None:
+            return cached
+        normalized = self._normalize(raw)
+        transformations = _equation_transformations() if subscripts else _transformations()
+        parsed = (normalized, sympy_parser.parse_expr(normalized, transformations=transformations))
+        self.parse_cache.put(key, parsed)
+        return parsed
+
+    def parse_cache_info(self) -> dict:
+        """Returns hit/miss/eviction counters of the parsed-expression cache."""
+        return self.parse_cache.info()
+
+    def _compile(self, expr: sp.Expr, var: Union[sp.Symbol, None] = None) -> Callable:
+        """Returns a NumPy callable of expr in var (default x), compiled with common-subexpression elimination and cached."""
+        var = self.x if var is None else var
+        key = (expr, var)
+        f = self.compile_cache.get(key)
+        if f is None:
+            extra = expr.free_symbols - {var}
+            if extra:
+                raise ValueError(f"Expression has free symbols other than {var}: {', '.join(sorted(map(str, extra)))}")
+            f = sp.lambdify(var, expr, "numpy", cse=True)
+            self.compile_cache.put(key, f)
+        return f
+
+    def compile_cache_info(self) -> dict:
+        """Returns hit/miss/eviction counters of the compiled-function cache."""
+        return self.compile_cache.info()
+
+    def evaluate_over(self, expr: Union[str, sp.Expr], x_values, chunk_size: int = 1 << 20,
+                      out: Union[np.ndarray, None] = None) -> Union[np.ndarray, Iterator[np.ndarray], str]:
+        """Evaluates an expression in x at many points with a cached compiled callable.
+
+        Arrays are converted to float64 and evaluated `chunk_size` points at a
+        time, so np.memmap inputs (and a C-contiguous memmap `out`) larger than
+        RAM only need one chunk of temporaries. Any other iterable is treated as
+        a stream of chunks and a generator of result chunks is returned. Points
+        outside the real domain of the expression come back as NaN.
+        """
+        try:
+            if isinstance(expr, str):
+                _, expr = self._parse(expr)
+            f = self._compile(expr)
+            if isinstance(x_values, (list, tuple)) or np.isscalar(x_values):
+                x_values = np.asarray(x_values, dtype=np.float64)
+            if not isinstance(x_values, np.ndarray):
+                return _evaluate_chunks(f, x_values)
+            if out is None:
+                out = np.empty(x_values.shape, dtype=np.float64)
+            elif out.shape != x_values.shape or not out.flags.c_contiguous:
+                raise ValueError("out must be a C-contiguous array with the same shape as x_values")
+            flat_x, flat_out = x_values.reshape(-1), out.reshape(-1)
+            for start in range(0, flat_x.size, chunk_size):
+                chunk = np.asarray(flat_x[start:start + chunk_size], dtype=np.float64)
+                flat_out[start:start + chunk_size] = plotting.safe_evaluate(f, chunk)
+            return out
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def _evaluate_fast(self, expression: str):
+        """Tries the pure-arithmetic tier, returning (normalized_text, result) or None when SymPy is needed."""
+        if not self.fast_path:
+            return None
+        normalized = self._normalize(expression)
+        try:
+            return normalized, fast_evaluate(normalized)
+        except (UnsupportedExpression, ArithmeticError, ValueError, TypeError):
+            return None
+
     def evaluate_expression(self, expression: str) -> Union[float, complex, str]:
-        """Evaluates a standard mathematical expression with robust parsing."""
+        """Evaluates a standard mathematical expression, using plain float math when no SymPy is needed."""
+        self.last_eval_tier = "sympy"
         try:
-            expression = self._auto_close_parentheses(expression)
-            expression = self._preprocess(expression)
-            transformations = (standard_transformations + (implicit_multiplication_application, convert_xor))
-            expr = parse_expr(expression, transformations=transformations)
-            
-            # If it's a boolean expression (like 5 != 3), evaluate it
-            if isinstance(expr, (bool, sp.logic.boolalg.BooleanAtom, sp.core.relational.Relational)):
-                result = bool(expr)
-            elif hasattr(expr, 'is_Boolean') and expr.is_Boolean:
-                result = bool(expr)
+            fast = self._evaluate_fast(expression)
+            if fast is not None:
+                self.last_eval_tier = "fast"
+                expression, result = fast
             else:
-                result = float(expr.evalf())
+                expression, expr = self._parse(expression)
+                euler = sp.Symbol(EULER_SYMBOL_NAME)
+                if isinstance(expr, sp.Basic) and euler in expr.free_symbols:
+                    expr = expr.subs(euler, sp.E)
+
+                # If it's a boolean expression (like 5 != 3), evaluate it
+                if isinstance(expr, (bool, sp.logic.boolalg.BooleanAtom, sp.core.relational.Relational)):
+                    result = bool(expr)
+                elif hasattr(expr, 'is_Boolean') and expr.is_Boolean:
+                    result = bool(expr)
+                else:
+                    result = float(expr.evalf())
             
+            self.eval_tier_counts[self.last_eval_tier] += 1
             self._add_to_history("Eval", expression, result)
             return result
         except Exception as e:
             return f"Error: {str(e)}"
 
-    def solve_equation(self, equation_str: str) -> List:
-        """Solves an equation for any variables found in the expression."""
+    def solve_equation(self, equation_str: Union[str, Iterable[str]], timeout: Union[float, None] = None,
+                       exact: Union[bool, None] = None, numeric: bool = False,
+                       x_range: Tuple[float, float] = (-10, 10)) -> List:
+        """Solves an equation ("lhs = rhs" or an expression equal to zero) for any variables found in it.
+
+        exact=True forces symbolic polynomial roots; numeric=True skips SymPy and
+        returns the real roots inside x_range found by the grid/Brent engine.
+        Several equations (a list, or one string separated by ';' or newlines)
+        are solved as a system with solve_system.
+        """
+        if not isinstance(equation_str, str) or EQUATION_SEPARATOR.search(equation_str.strip()):
+            return self.solve_system(equation_str, timeout, exact)
         try:
-            equation_str = self._auto_close_parentheses(equation_str)
-            equation_str = self._preprocess(equation_str)
-            transformations = (standard_transformations + (implicit_multiplication_application, convert_xor))
-            expr = parse_expr(equation_str, transformations=transformations)
+            equation_str, expr = self._parse_equation(equation_str)
             
             # Detect variables (free symbols)
             vars = list(expr.free_symbols)
             if not vars:
                 return ["No variables found to solve for."]
             
-            # Solve for all detected variables
-            solutions = sp.solve(expr, vars)
-            self._add_to_history("Solve", equation_str, solutions)
+            if len(vars) == 1:
+                solutions = self._solve_single(expr, vars[0], timeout, exact, numeric, x_range)
+            else:
+                solutions = SolveResult(self._symbolic(sp.solve, expr, vars, timeout=timeout))
+            self._add_to_history("Solve", equation_str, self._mark_approximate(solutions))
             return solutions
         except Exception as e:
             return [f"Error: {str(e)}"]
 
-    def matrix_operations(self, op: str, *matrices: np.ndarray) -> Union[np.ndarray, float, str]:
-        """Performs linear algebra operations using numpy."""
+    def solve_system(self, equations: Union[str, Iterable[str]], timeout: Union[float, None] = None,
+                     exact: Union[bool, None] = None) -> List:
+        """Solves several equations simultaneously for all their variables.
+
+        Linear systems are converted with linear_eq_to_matrix and solved with
+        NumPy (LU or least squares), or by fraction-free elimination when exact.
+        The result carries the coefficient rank; an underdetermined system is
+        solved for its pivot variables in terms of the free ones, and an
+        inconsistent one yields no solutions. Nonlinear systems go to sp.solve.
+        """
+        from sympy.solvers.solveset import NonlinearError
         try:
+            if isinstance(equations, str):
+                equations = EQUATION_SEPARATOR.split(equations)
+            parsed = [self._parse_equation(eq) for eq in equations if eq.strip()]
+            if not parsed:
+                return ["No equations given."]
+            text = "; ".join(eq for eq, _ in parsed)
+            exprs = [expr for _, expr in parsed]
+            symbols = sorted(set().union(*(expr.free_symbols for expr in exprs)), key=str)
+            if not symbols:
+                return ["No variables found to solve for."]
+            try:
+                A, b = sp.linear_eq_to_matrix(exprs, symbols)
+            except NonlinearError:
+                solutions = SolveResult(self._symbolic(sp.solve, exprs, symbols, timeout=timeout))
+            else:
+                exact = self.exact_roots if exact is None else exact
+                solve = linear_systems.eliminate if exact else linear_systems.solve_numeric
+                solution, rank = solve(A, b, symbols)
+                free = [symbol for symbol in symbols if solution is not None and symbol not in solution]
+                solutions = SolveResult([] if solution is None else [solution],
+                                        method="elimination" if exact else "linear", rank=rank, free_variables=free)
+            self._add_to_history("Solve", text, self._mark_approximate(solutions))
+            return solutions
+        except Exception as e:
+            return [f"Error: {str(e)}"]
+
+    def _parse_equation(self, raw: str) -> Tuple[str, sp.Expr]:
+        """Parses "lhs = rhs" into lhs - rhs; input without '=' is parsed as an expression equal to zero.
+
+        Names with digits (x1, v0) are unknowns of their own, not products.
+        """
+        sides = EQUALS_SIGN.split(raw)
+        if len(sides) == 1:
+            return self._parse(raw, subscripts=True)
+        if len(sides) != 2:
+            raise ValueError(f"Expected at most one '=' in equation: {raw.strip()}")
+        lhs_text, lhs = self._parse(sides[0].strip(), subscripts=True)
+        rhs_text, rhs = self._parse(sides[1].strip(), subscripts=True)
+        return f"{lhs_text} = {rhs_text}", lhs - rhs
+
+    def _symbolic(self, fn, *args, timeout: Union[float, None] = None):
+        """Runs a SymPy operation in a killable subprocess under the per-call or engine-wide budget.
+
+        Completed results are looked up in and stored to the persistent symbolic cache;
+        timeouts and errors are never cached.
+        """
+        key = None
+        cache = self.symbolic_cache
+        if cache is not None:
+            key = cache.key(fn.__name__, *args)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        budget = self.symbolic_timeout if timeout is None else timeout
+        result = self.deadline_pool.call(fn, args, budget)
+        if key is not None:
+            cache.put(key, fn.__name__, result)
+        return result
+
+    def symbolic_cache_info(self) -> Union[dict, None]:
+        """Returns hit-rate statistics of the persistent symbolic cache, or None when it is disabled."""
+        cache = self.symbolic_cache
+        return cache.info() if cache is not None else None
+
+    def _mark_approximate(self, result) -> str:
+        return f"≈ {result}" if getattr(result, "approximate", False) else str(result)
+
+    def _numeric_roots(self, expr: sp.Expr, var: sp.Symbol, x_range: Tuple[float, float] = (-10, 10)) -> List[float]:
+        """Finds the real roots in x_range by bracketing on a dense grid and refining with Brent's method."""
+        return roots.real_roots(self._compile(expr, var), float(x_range[0]), float(x_range[1]))
+
+    def _polynomial_roots(self, expr: sp.Expr, var: sp.Symbol) -> Union[SolveResult, None]:
+        """Solves a polynomial with numeric coefficients via companion eigenvalues; None for any other input."""
+        if not expr.is_polynomial(var):
+            return None
+        try:
+            coeffs = [complex(c) for c in sp.Poly(expr, var).all_coeffs()]
+        except (TypeError, sp.PolynomialError):
+            return None
+        if len(coeffs) < 2:
+            return None
+        pairs = roots.polynomial_roots(coeffs)
+        return SolveResult([root for root, _ in pairs], method="polynomial",
+                           multiplicities=[multiplicity for _, multiplicity in pairs])
+
+    def _solve_single(self, expr: sp.Expr, var: sp.Symbol, timeout: Union[float, None] = None,
+                      exact: Union[bool, None] = None, numeric: bool = False,
+                      x_range: Tuple[float, float] = (-10, 10)) -> SolveResult:
+        """Solves for one variable: polynomial engine first, then SymPy, then real roots in x_range numerically.
+
+        The numeric engine also takes over when SymPy overruns its budget or has
+        no algorithm for the equation (e.g. sin(x) - x/10).
+        """
+        if numeric:
+            return SolveResult(self._numeric_roots(expr, var, x_range), method="numeric")
+        if not (self.exact_roots if exact is None else exact):
+            solutions = self._polynomial_roots(expr, var)
+            if solutions is not None:
+                return solutions
+        try:
+            return SolveResult(self._symbolic(sp.solve, expr, var, timeout=timeout))
+        except (SymbolicTimeout, NotImplementedError):
+            return SolveResult(self._numeric_roots(expr, var, x_range), method="numeric")
+
+    def _solve_for_x(self, expr: sp.Expr, timeout: Union[float, None] = None, exact: Union[bool, None] = None,
+                     numeric: bool = False, x_range: Tuple[float, float] = (-10, 10)) -> SolveResult:
+        return self._solve_single(expr, self.x, timeout, exact, numeric, x_range)
+
+    def _differentiate(self, expr: sp.Expr, timeout: Union[float, None] = None) -> Tuple[sp.Expr, str]:
+        try:
+            return self._symbolic(sp.diff, expr, self.x, timeout=timeout), "symbolic"
+        except SymbolicTimeout:
+            return sp.Derivative(expr, self.x), "unevaluated"
+
+    def _integrate(self, expr: sp.Expr, timeout: Union[float, None] = None) -> Tuple[sp.Expr, str]:
+        try:
+            integral = self._symbolic(sp.integrate, expr, self.x, timeout=timeout)
+        except SymbolicTimeout:
+            return sp.Integral(expr, self.x), "unevaluated"
+        return integral, "unevaluated" if integral.has(sp.Integral) else "symbolic"
+
+    def _numeric_integral(self, expr: sp.Expr, x_range: Tuple[float, float], abs_tol: float = 1.49e-8,
+                          rel_tol: float = 1.49e-8) -> Tuple[float, float]:
+        """Definite integral over x_range by adaptive Gauss-Kronrod quadrature, returned as (value, error)."""
+        return quadrature.gauss_kronrod(self._compile(expr), float(x_range[0]), float(x_range[1]), abs_tol, rel_tol)
+
+    def definite_integral(self, expression_str: str, x_range: Tuple[float, float] = (0, 1),
+                          abs_tol: float = 1.49e-8, rel_tol: float = 1.49e-8) -> Union[dict, str]:
+        """Numerically integrates a function of x over x_range (limits may be ±inf) with an error estimate."""
+        try:
+            expression_str, expr = self._parse(expression_str)
+            value, error = self._numeric_integral(expr, x_range, abs_tol, rel_tol)
+            self._add_to_history("Integral", expression_str, f"∫[{x_range[0]}, {x_range[1]}] ≈ {value} ± {error:.1e}")
+            return {"range": tuple(x_range), "value": value, "error": error, "method": "numeric"}
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def evaluate_many(self, expressions: Iterable[str], max_workers: Union[int, None] = None,
+                      chunksize: int = 16, errors: str = "return", executor: Union[Executor, None] = None,
+                      progress: Union[Callable[[int, int], None], None] = None) -> List:
+        """Evaluates many expressions over a process pool, keeping input order and saving history once."""
+        return self._run_many("evaluate_expression", expressions, max_workers, chunksize, errors, executor, progress)
+
+    def solve_many(self, equations: Iterable[str], max_workers: Union[int, None] = None,
+                   chunksize: int = 16, errors: str = "return", executor: Union[Executor, None] = None,
+                   progress: Union[Callable[[int, int], None], None] = None) -> List:
+        """Solves many equations over a process pool, keeping input order and saving history once."""
+        return self._run_many("solve_equation", equations, max_workers, chunksize, errors, executor, progress)
+
+    def _run_many(self, method_name: str, items: Iterable[str], max_workers: Union[int, None],
+                  chunksize: int, errors: str, executor: Union[Executor, None],
+                  progress: Union[Callable[[int, int], None], None] = None) -> List:
+        """Fans a single-item engine method out over workers and applies the per-item error policy.
+
+        errors="return" keeps the engine's usual error value in place, "none" replaces it
+        with None and "raise" raises ValueError for the first failing item. max_workers=1
+        (or a single item) runs in-process without a pool. progress(done, total) is called
+        as results arrive; an exception it raises abandons the batch.
+        """
+        if errors not in BATCH_ERROR_POLICIES:
+            raise ValueError(f"errors must be one of {BATCH_ERROR_POLICIES}")
+        items = list(items)
+        if executor is None and (max_workers == 1 or len(items) <= 1):
+            outcomes = self._run_serial(method_name, items, progress)
+        else:
+            # The settings travel with every task, so caller-supplied executors (including
+            # thread pools) run with this engine's options too
+            settings = [self._worker_kwargs()] * len(items)
+            if executor is not None:
+                outcomes = _with_progress(executor.map(_run_in_worker, [method_name] * len(items), items, settings,
+                                                       chunksize=chunksize), len(items), progress)
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                         initargs=(settings[0],)) as pool:
+                    outcomes = _with_progress(pool.map(_run_in_worker, [method_name] * len(items), items, settings,
+                                                       chunksize=chunksize), len(items), progress)
+
+        results = []
+        entries = []
+        try:
+            for index, (result, item_entries) in enumerate(outcomes):
+                if _is_error_result(result):
+                    if errors == "raise":
+                        raise ValueError(f"Item {index} ({items[index]!r}) failed: {result}")
+                    if errors == "none":
+                        result = None
+                entries.extend(item_entries)
+                results.append(result)
+        finally:
+            if self.record_history and entries:
+                self._extend_history(entries)
+        return results
+
+    def _worker_kwargs(self) -> dict:
+        """Settings for the engines of worker processes."""
+        return {"parse_cache_size": self.parse_cache.maxsize, "fast_path": self.fast_path,
+                "symbolic_timeout": self.symbolic_timeout, "exact_roots": self.exact_roots,
+                "symbolic_cache_file": self.symbolic_cache_file}
+
+    def _run_serial(self, method_name: str, items: List[str],
+                    progress: Union[Callable[[int, int], None], None] = None) -> List[Tuple[Any, List[dict]]]:
+        """Runs a batch in-process, collecting history entries instead of writing after every item."""
+        method = getattr(self, method_name)
+        outcomes = []
+        self._history_buffer = []
+        try:
+            for item in items:
+                start = len(self._history_buffer)
+                result = method(item)
+                outcomes.append((result, self._history_buffer[start:]))
+                if progress is not None:
+                    progress(len(outcomes), len(items))
+        finally:
+            self._history_buffer = None
+        return outcomes
+
+    def matrix_operations(self, op: str, *matrices: Union[np.ndarray, str],
+                          structure: Union[str, None] = None, out: Union[str, np.ndarray, None] = None,
+                          block_size: int = 1024, workers: int = 1) -> Union[np.ndarray, tuple, float, str]:
+        """Performs linear algebra operations using numpy, broadcasting over stacks of (..., n, n) matrices.
+
+        det/inv/eig/solve detect diagonal, triangular, Hermitian and banded
+        structure (or take it from `structure`) and dispatch to the cheaper
+        routine. "solve" computes A^-1 b without forming the inverse.
+        Sparse (CSR/COO) operands support add, multiply and "matvec"; "cg" and
+        "gmres" solve A x = b iteratively and return (x, info).
+        "multiply" runs out of core when given `out` (a .npy path or memmap) or
+        .npy paths as operands: operands are memory-mapped and multiplied in
+        block_size tiles, optionally on `workers` threads.
+        """
+        try:
+            if any(isinstance(m, (sparse_matrix.CSRMatrix, sparse_matrix.COOMatrix)) for m in matrices):
+                return self._sparse_operation(op, *matrices)
+            if op in ("matvec", "cg", "gmres"):
+                return self._sparse_operation(op, *matrices)
+            if op == "multiply" and (out is not None or any(isinstance(m, str) for m in matrices)):
+                a, b = (matrix_ops.open_npy(m) for m in matrices[:2])
+                if out is None:
+                    raise ValueError("Out-of-core multiply needs an out .npy path or memmap")
+                return matrix_ops.blocked_matmul(a, b, out, block_size, workers)
+            matrices = [np.asarray(m) for m in matrices]
             if op == "add":
                 return np.add(matrices[0], matrices[1])
             elif op == "multiply":
-                return np.dot(matrices[0], matrices[1])
-            elif op == "det":
-                return np.linalg.det(matrices[0])
-            elif op == "inv":
-                return np.linalg.inv(matrices[0])
-            elif op == "eig":
-                return np.linalg.eig(matrices[0])
+                return matrix_ops.multiply(matrices[0], matrices[1])
+            elif op in ("det", "inv", "eig", "solve"):
+                a = matrices[0]
+                if a.ndim < 2 or a.shape[-1] != a.shape[-2]:
+                    raise ValueError(f"{op} needs square matrices, got shape {a.shape}")
+                detected = matrix_ops.detect_structure(a)
+                if structure is not None:
+                    if structure not in matrix_ops.STRUCTURES:
+                        raise ValueError(f"Unknown structure '{structure}'")
+                    detected = (structure,) + detected[1:]
+                if op == "det":
+                    return matrix_ops.det(a, detected)
+                elif op == "inv":
+                    return matrix_ops.inv(a, detected)
+                elif op == "eig":
+                    return matrix_ops.eig(a, detected)
+                return matrix_ops.solve(a, matrices[1], detected)
             else:
                 return "Unknown operation"
         except Exception as e:
             return f"Error: {str(e)}"
 
+    def _sparse_operation(self, op: str, *matrices) -> Union[np.ndarray, tuple, sparse_matrix.CSRMatrix]:
+        """Runs add/multiply/matvec/cg/gmres where any operand may be CSR/COO; dense operands stay dense."""
+        if op not in ("add", "multiply", "matvec", "cg", "gmres"):
+            raise ValueError(f"Operation '{op}' is not supported for sparse matrices")
+        a, b = (sparse_matrix.as_csr(m) if isinstance(m, (sparse_matrix.CSRMatrix, sparse_matrix.COOMatrix))
+                else np.asarray(m) for m in matrices[:2])
+        if op == "add":
+            return a + b
+        elif op in ("multiply", "matvec"):
+            return a @ b
+        elif op == "cg":
+            return sparse_matrix.conjugate_gradient(a, b)
+        return sparse_matrix.gmres(a, b)
+
+    def render_function(self, expression_str: str, x_range: Tuple[float, float] = (-10, 10), fmt: str = "png",
+                        max_points: int = 2000) -> Union[bytes, np.ndarray, str]:
+        """Renders a function plot in memory as PNG bytes (fmt="png") or an RGBA array (fmt="rgba")."""
+        try:
+            _, expr = self._parse(expression_str)
+            x_vals, y_vals = plotting.adaptive_sample(self._compile(expr), x_range[0], x_range[1], max_points=max_points)
+            return plotting.render_plot(x_vals, y_vals, f"y = {expression_str}", f"Plot of {expression_str}", fmt=fmt)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
     def plot_function(self, expression_str: str, x_range: Tuple[float, float] = (-10, 10)):
-        """Plots a function using matplotlib."""
+        """Plots a function and saves it to self.plot_path for external viewers."""
+        png = self.render_function(expression_str, x_range)
+        if not isinstance(png, bytes):
+            return png
         try:
-            expr = sp.sympify(expression_str)
-            f = sp.lambdify(self.x, expr, "numpy")
-            x_vals = np.linspace(x_range[0], x_range[1], 400)
-            y_vals = f(x_vals)
-
-            plt.figure(figsize=(8, 6))
-            plt.plot(x_vals, y_vals, label=f"y = {expression_str}")
-            plt.axhline(0, color='black', lw=1)
-            plt.axvline(0, color='black', lw=1)
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.legend()
-            plt.title(f"Plot of {expression_str}")
-            
-            # Save to a temporary file for display if needed, or just show
-            # For now, we'll just return the plot object or save it
-            plot_path = "C:\\Users\\sao\\Documents\\calculator\\last_plot.png"
-            plt.savefig(plot_path)
-            plt.close()
-            return plot_path
+            with open(self.plot_path, 'wb') as f:
+                f.write(png)
+            return self.plot_path
         except Exception as e:
             return f"Error: {str(e)}"
 
-    def analyze_function(self, expression_str: str) -> dict:
-        """Provides a comprehensive analysis of a function."""
+    def analyze_function(self, expression_str: str, timeout: Union[float, None] = None,
+                         x_range: Tuple[float, float] = (-10, 10),
+                         fields: Iterable[str] = ANALYSIS_FIELDS, exact: Union[bool, None] = None,
+                         numeric: bool = False,
+                         progress: Union[Callable[[int, int], None], None] = None) -> Union[LazyAnalysis, dict]:
+        """Analyzes a function, computing only `fields` up front; other fields are computed when first read.
+
+        numeric=True finds the real roots inside x_range numerically instead of calling sp.solve.
+        progress(done, total) is called after each field; an exception it raises ends the analysis.
+        """
         try:
-            expression_str = self._auto_close_parentheses(expression_str)
-            expr = sp.sympify(expression_str)
-            analysis = {
-                "expression": expression_str,
-                "roots": sp.solve(expr, self.x),
-                "derivative": sp.diff(expr, self.x),
-                "integral": sp.integrate(expr, self.x),
-                "bref": self.get_bref_analysis(expr),
-                "plot_path": self.plot_function(expression_str)
-            }
-            self._add_to_history("Analysis", expression_str, analysis['bref'])
+            expression_str, expr = self._parse(expression_str)
+            analysis = LazyAnalysis(self, expression_str, expr, timeout, x_range, exact, numeric)
+            fields = tuple(fields)
+            for done, field in enumerate(fields, 1):
+                analysis[field]
+                if progress is not None:
+                    progress(done, len(fields))
+            summary = analysis["bref"] if analysis.computed("bref") else "Fields: " + ", ".join(fields)
+            self._add_to_history("Analysis", expression_str, summary)
             return analysis
         except Exception as e:
             return {"error": str(e)}
 
-    def get_bref_analysis(self, expr: sp.Expr) -> str:
-        """Returns a human-readable summary of the mathematical properties."""
+    def get_bref_analysis(self, expr: sp.Expr, roots: Union[SolveResult, None] = None) -> str:
+        """Returns a human-readable summary of the mathematical properties, reusing roots when already solved."""
         try:
             bref = []
             if expr.is_polynomial(self.x):
@@ -204,17 +849,28 @@ class CalculatorEngine:
             if expr.has(sp.log):
                 bref.append("Logarithmic function")
             
-            roots = sp.solve(expr, self.x)
-            bref.append(f"Has {len(roots)} root(s)")
+            if roots is None:
+                roots = self._solve_for_x(expr)
+            if roots.method == "numeric":
+                bref.append(f"Has {len(roots)} real root(s) found numerically")
+            elif roots.multiplicities and any(m > 1 for m in roots.multiplicities):
+                bref.append(f"Has {len(roots)} distinct root(s), {sum(roots.multiplicities)} with multiplicity")
+            else:
+                bref.append(f"Has {len(roots)} root(s)")
             
             return " | ".join(bref) if bref else "General mathematical expression"
         except:
             return "Complex mathematical expression"
 
-    def export_report(self, analysis: dict, filename: str = "report.png"):
-        """Exports the analysis report as a high-quality image."""
+    def export_report(self, analysis: Mapping, filename: Union[str, None] = "report.png"):
+        """Exports the analysis report as a high-quality image, or returns the PNG bytes when filename is None."""
         try:
-            fig, ax = plt.subplots(figsize=(10, 8))
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+            fig = Figure(figsize=(10, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
             ax.axis('off')
             
             text = f"Mathematical Analysis Report\n"
@@ -224,19 +880,28 @@ class CalculatorEngine:
             text += f"Roots: {analysis['roots']}\n"
             text += f"Derivative: {analysis['derivative']}\n"
             text += f"Integral: {analysis['integral']}\n"
+            if analysis.get('methods', {}).get('integral', 'symbolic') != 'symbolic':
+                definite = analysis['definite_integral']
+                text += f"Definite integral over {definite['range']}: {definite['value']:.10g} ± {definite['error']:.1e}\n"
             
-            plt.text(0.05, 0.95, text, transform=ax.transAxes, fontsize=12, verticalalignment='top', family='monospace')
+            ax.text(0.05, 0.95, text, transform=ax.transAxes, fontsize=12, verticalalignment='top', family='monospace')
             
-            # Embed the plot if it exists
-            if os.path.exists(analysis['plot_path']):
-                from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-                img = plt.imread(analysis['plot_path'])
+            # Embed the in-memory plot, falling back to a plot file from older analysis dicts
+            img = analysis.get('plot_image')
+            if not isinstance(img, np.ndarray) and os.path.exists(str(analysis.get('plot_path'))):
+                from matplotlib.image import imread
+                img = imread(analysis['plot_path'])
+            if isinstance(img, np.ndarray):
                 imagebox = OffsetImage(img, zoom=0.5)
                 ab = AnnotationBbox(imagebox, (0.5, 0.3), frameon=False)
                 ax.add_artist(ab)
             
-            plt.savefig(filename, dpi=300, bbox_inches='tight')
-            plt.close()
+            if filename is None:
+                import io
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
+                return buffer.getvalue()
+            fig.savefig(filename, dpi=300, bbox_inches='tight')
             return filename
         except Exception as e:
             return f"Export Error: {str(e)}"
@@ -244,31 +909,232 @@ class CalculatorEngine:
     def extract_text_from_image(self, image_path: str) -> str:
         """Extracts mathematical text from an image using OCR."""
         try:
-            img = Image.open(image_path)
-            text = pytesseract.image_to_string(img)
-            # Basic cleanup
-            text = text.replace('\n', ' ').strip()
+            cache = self.ocr_cache
+            key = ocr.content_key(image_path) if cache is not None else None
+            text = cache.get(key) if key is not None else None
+            if text is None:
+                text = ocr.recognize(image_path)
+                if key is not None:
+                    cache.put(key, "ocr", text)
             self._add_to_history("OCR", image_path, text)
             return text
         except Exception as e:
             return f"OCR Error: {str(e)}"
 
+    def extract_text_from_images(self, source: Union[str, Iterable[str]],
+                                 workers: Union[int, None] = None) -> Iterator[Tuple[str, str]]:
+        """Recognizes a directory or list of images on a process pool, yielding (path, text) as each completes.
+
+        Images are preprocessed (grayscale, downscale, binarize, deskew) before
+        Tesseract runs, and unchanged images are served from the OCR cache.
+        """
+        for path, text in ocr.ocr_batch(source, workers, self.ocr_cache):
+            if not text.startswith("OCR Error"):
+                self._add_to_history("OCR", path, text)
+            yield path, text
+
+    def solve_images(self, source: Union[str, Iterable[str]], ocr_workers: Union[int, None] = None,
+                     math_workers: int = 1, queue_size: int = OCR_QUEUE_SIZE) -> Iterator[dict]:
+        """Streams images through OCR, normalization and evaluate/solve, yielding one record per image.
+
+        OCR runs on its own process pool (ocr_workers) from a background thread
+        that feeds a queue of at most queue_size texts. Each text is normalized,
+        classified as an equation (it has '=' or ';') or an expression, and
+        dispatched to solve_equation or evaluate_expression, inline when
+        math_workers is 1 or on a second pool with at most 2 * math_workers
+        items in flight. The stages overlap, so throughput is bounded by the
+        slower one. Records are {"path", "text", "input", "kind"} plus "result"
+        or "error", in completion order.
+        """
+        texts = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        finished = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    texts.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def recognize():
+            try:
+                for item in self.extract_text_from_images(source, ocr_workers):
+                    if not put(item):
+                        return
+            except Exception as e:
+                put(e)
+            put(finished)
+
+        producer = threading.Thread(target=recognize, name="ocr-stage", daemon=True)
+        producer.start()
+        pool = None
+        if math_workers > 1:
+            pool = ProcessPoolExecutor(max_workers=math_workers, initializer=_init_worker,
+                                       initargs=(self._worker_kwargs(),))
+        pending = {}
+        try:
+            while True:
+                try:
+                    # While math results are pending, poll so they are yielded as soon as they finish
+                    item = texts.get(timeout=0.05 if pending else None)
+                except queue.Empty:
+                    yield from self._collect_math(pending, block=False)
+                    continue
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                record, method_name = self._classify_text(*item)
+                if method_name is None:
+                    yield record
+                elif pool is None:
+                    yield self._finish_record(record, getattr(self, method_name)(record["input"]))
+                else:
+                    pending[pool.submit(_run_in_worker, method_name, record["input"], self._worker_kwargs())] = record
+                    while len(pending) >= 2 * math_workers:
+                        yield from self._collect_math(pending, block=True)
+            while pending:
+                yield from self._collect_math(pending, block=True)
+        finally:
+            stop.set()
+            producer.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def _classify_text(self, path: str, text: str) -> Tuple[dict, Union[str, None]]:
+        """Normalizes recognized text and picks the engine method for it (None when there is nothing to run)."""
+        record = {"path": path, "text": text, "input": None, "kind": None}
+        if text.startswith("OCR Error"):
+            record["error"] = text
+            return record, None
+        record["input"] = self._normalize(text).strip()
+        if not record["input"]:
+            record["error"] = "Error: no text recognized"
+            return record, None
+        if EQUALS_SIGN.search(record["input"]) or ";" in record["input"]:
+            record["kind"] = "equation"
+            return record, "solve_equation"
+        record["kind"] = "expression"
+        return record, "evaluate_expression"
+
+    def _finish_record(self, record: dict, result) -> dict:
+        if _is_error_result(result):
+            record["error"] = result[0] if isinstance(result, list) else result
+        else:
+            record["result"] = result
+        return record
+
+    def _collect_math(self, pending: dict, block: bool) -> Iterator[dict]:
+        done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            record = pending.pop(future)
+            result, entries = future.result()
+            if self.record_history and entries:
+                self._extend_history(entries)
+            yield self._finish_record(record, result)
+
+    def ocr_cache_info(self) -> Union[dict, None]:
+        """Returns hit/miss/eviction statistics of the OCR cache, or None when it is disabled."""
+        cache = self.ocr_cache
+        return cache.info() if cache is not None else None
+
     def get_ai_guidance(self, expression: str) -> str:
         """Provides AI-powered hints/explanation for a math expression."""
+        return self.get_ai_guidance_many([expression])[0]
+
+    def get_ai_guidance_many(self, expressions: Iterable[str]) -> List[str]:
+        """Generates hints for many expressions in padded batches; see ai_info() for per-request latency."""
+        expressions = list(expressions)
+        keys = [self._hint_key(expression) for expression in expressions]
+        hints = [self.hint_cache.get(key) if key is not None else None for key in keys]
+        # Cache hits never reach the model, so a fully cached batch does not import torch
+        missing = {}
+        for i, hint in enumerate(hints):
+            if hint is None:
+                # Spellings of the same expression in one batch are generated once
+                missing.setdefault(keys[i] if keys[i] is not None else i, []).append(i)
+        if missing:
+            try:
+                generated = self.hint_model.generate([expressions[group[0]] for group in missing.values()])
+            except Exception as e:
+                error = f"AI Hint unavailable: {str(e)}"
+                return [error if hint is None else hint for hint in hints]
+            for (key, group), hint in zip(missing.items(), generated):
+                for i in group:
+                    hints[i] = hint
+                if keys[group[0]] is not None:
+                    self.hint_cache.put(key, "hint", hint)
+        for expression, hint in zip(expressions, hints):
+            self._add_to_history("AI Hint", expression, hint)
+        return hints
+
+    def _hint_key(self, expression: str) -> Union[str, None]:
+        """Hint cache key: the parsed expression (so x^2 and x**2 share an entry) plus the generation settings."""
+        if self.hint_cache is None:
+            return None
         try:
-            self._load_ai()
-            # Refined prompt for T5 to focus on hints
-            input_text = f"provide a math hint for: {expression}"
-            input_ids = self.ai_tokenizer.encode(input_text, return_tensors="pt")
-            
-            with self.torch_module.no_grad():
-                outputs = self.ai_model.generate(input_ids, max_length=100)
-            
-            guidance = self.ai_tokenizer.decode(outputs[0], skip_special_tokens=True)
-            self._add_to_history("AI Hint", expression, guidance)
-            return guidance
-        except Exception as e:
-            return f"AI Hint unavailable: {str(e)}"
+            canonical = tuple(self._parse(side)[1] for side in EQUALS_SIGN.split(expression))
+        except Exception:
+            canonical = (self._normalize(expression).strip(),)
+        params = sorted(self.hint_model.generation_params().items())
+        return self.hint_cache.key("hint", *canonical, str(params))
+
+    def ai_info(self) -> dict:
+        return self.hint_model.info()
+
+    def hint_cache_info(self) -> Union[dict, None]:
+        """Returns hit/miss/eviction statistics of the persistent hint cache, or None when it is disabled."""
+        cache = self.hint_cache
+        return cache.info() if cache is not None else None
+
+def _with_progress(outcomes: Iterable, total: int, progress: Union[Callable[[int, int], None], None]) -> List:
+    """Collects outcomes in order, calling progress(done, total) after each one."""
+    collected = []
+    for outcome in outcomes:
+        collected.append(outcome)
+        if progress is not None:
+            progress(len(collected), total)
+    return collected
+
+def _evaluate_chunks(f: Callable, chunks: Iterable) -> Iterator[np.ndarray]:
+    for chunk in chunks:
+        yield plotting.safe_evaluate(f, np.asarray(chunk, dtype=np.float64))
+
+def _is_error_result(result) -> bool:
+    """Recognizes the error values returned by evaluate_expression and solve_equation."""
+    if isinstance(result, list) and len(result) == 1:
+        result = result[0]
+    return isinstance(result, str) and result.startswith("Error")
+
+# Engines used by evaluate_many/solve_many workers, per thread and per settings
+_worker_engines = threading.local()
+
+def _get_worker_engine(engine_kwargs: dict) -> CalculatorEngine:
+    engines = getattr(_worker_engines, "by_settings", None)
+    if engines is None:
+        engines = _worker_engines.by_settings = {}
+    key = tuple(sorted(engine_kwargs.items()))
+    if key not in engines:
+        # Workers only evaluate and solve; hints and OCR stay in the parent
+        engines[key] = CalculatorEngine(history_file=None, hint_cache_file=None, ocr_cache_file=None,
+                                        **engine_kwargs)
+    return engines[key]
+
+def _init_worker(engine_kwargs: dict):
+    _get_worker_engine(engine_kwargs)
+
+def _run_in_worker(method_name: str, item: str, engine_kwargs: dict) -> Tuple[Any, List[dict]]:
+    """Runs one engine call in a worker and returns its result with the history it produced."""
+    engine = _get_worker_engine(engine_kwargs)
+    engine._history_buffer = []
+    try:
+        result = getattr(engine, method_name)(item)
+        return result, engine._history_buffer
+    finally:
+        engine._history_buffer = None
 
 import os
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import ast
+import math
+import operator
+from typing import Union
+
+class UnsupportedExpression(Exception):
+    """Raised when an expression is outside the pure-arithmetic subset."""
+
+_SQRT2_2 = math.sqrt(2) / 2
+_SQRT3_2 = math.sqrt(3) / 2
+_SIN_TABLE = {0: 0.0, 30: 0.5, 45: _SQRT2_2, 60: _SQRT3_2, 90: 1.0}
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+    'E': math.e
+}
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod
+}
+
+UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg
+}
+
+COMPARE_OPS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne
+}
+
+# Largest integer exponent evaluated exactly before switching to float pow
+MAX_INT_EXPONENT = 1024
+# Only arguments within this many multiples of pi/12 are matched against the special angles;
+# beyond it float spacing is too coarse to tell an exact multiple from a nearby value
+MAX_SPECIAL_MULTIPLE = 10**6
+# Absolute distance (in multiples of pi/12) at which an argument counts as an exact multiple
+SPECIAL_ANGLE_TOL = 1e-9
+
+def _special_sin(arg: float) -> Union[float, None]:
+    """Returns the exact sine for multiples of pi/6 and pi/4, where SymPy simplifies symbolically."""
+    k = arg * 12 / math.pi
+    if not abs(k) <= MAX_SPECIAL_MULTIPLE:
+        return None
+    nearest = round(k)
+    if abs(k - nearest) > SPECIAL_ANGLE_TOL or (nearest % 2 and nearest % 3):
+        return None
+    deg = (nearest * 15) % 360
+    sign = 1
+    if deg >= 180:
+        deg -= 180
+        sign = -1
+    if deg > 90:
+        deg = 180 - deg
+    value = _SIN_TABLE[deg]
+    return sign * value if value else 0.0
+
+def _sin(arg):
+    special = _special_sin(arg)
+    return math.sin(arg) if special is None else special
+
+def _cos(arg):
+    special = _special_sin(arg + math.pi / 2)
+    return math.cos(arg) if special is None else special
+
+def _tan(arg):
+    sin_v, cos_v = _special_sin(arg), _special_sin(arg + math.pi / 2)
+    if sin_v is None or cos_v is None:
+        return math.tan(arg)
+    if cos_v == 0.0:
+        # SymPy yields zoo here; let the fallback report it
+        raise ZeroDivisionError("tan undefined")
+    return sin_v / cos_v
+
+# The functions on the Scientific buttons, under their SymPy names
+FUNCTIONS = {
+    'sin': _sin,
+    'cos': _cos,
+    'tan': _tan,
+    'asin': math.asin,
+    'acos': math.acos,
+    'atan': math.atan,
+    'sqrt': math.sqrt,
+    'log': math.log,
+    'exp': math.exp,
+    'abs': abs
+}
+
+def _power(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and 0 <= exponent <= MAX_INT_EXPONENT:
+        return base ** exponent
+    return math.pow(base, exponent)
+
+def _eval(node):
+    if isinstance(node, ast.Expression):
+        return _eval(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in CONSTANTS:
+        return CONSTANTS[node.id]
+    if isinstance(node, ast.BinOp):
+        left, right = _eval(node.left), _eval(node.right)
+        if isinstance(node.op, ast.Pow):
+            return _power(left, right)
+        if type(node.op) in BINARY_OPS:
+            return BINARY_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        return UNARY_OPS[type(node.op)](_eval(node.operand))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+        if len(node.args) != 1 or node.keywords:
+            raise UnsupportedExpression(f"{node.func.id} with {len(node.args)} arguments")
+        return float(FUNCTIONS[node.func.id](float(_eval(node.args[0]))))
+    if isinstance(node, ast.Compare):
+        left = _eval(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _eval(comparator)
+            if type(op) not in COMPARE_OPS or isinstance(left, bool) or isinstance(right, bool):
+                raise UnsupportedExpression("unsupported comparison")
+            exact = isinstance(left, int) and isinstance(right, int)
+            if isinstance(op, (ast.Eq, ast.NotEq)) and not exact:
+                # A float here may stand for a SymPy Rational or surd (1/2, 2^-1, sin(pi/6)),
+                # which never compares equal to a Float, so only integer equality is decided here
+                raise UnsupportedExpression("inexact equality")
+            if not exact and math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-12):
+                # Rounding error could flip the order of values that are exactly equal symbolically
+                raise UnsupportedExpression("inexact ordering")
+            if not COMPARE_OPS[type(op)](left, right):
+                return False
+            left = right
+        return True
+    raise UnsupportedExpression(f"unsupported syntax: {type(node).__name__}")
+
+def fast_evaluate(expression: str) -> Union[float, bool]:
+    """Evaluates a preprocessed, symbol-free expression with plain float math.
+
+    Raises UnsupportedExpression (or the underlying math error) whenever the
+    input needs SymPy, so callers can fall back to the symbolic path.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise UnsupportedExpression(str(e))
+    result = _eval(tree)
+    if isinstance(result, bool):
+        return result
+    if not isinstance(result, (int, float)):
+        raise UnsupportedExpression("non-real result")
+    result = float(result)
+    if math.isnan(result) or math.isinf(result):
+        raise UnsupportedExpression("non-finite result")
+    return result
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from typing import List, Union
+
+# T5 prompt; kept fixed so hints stay comparable across batches
+HINT_PROMPT = "provide a math hint for: {}"
+DEFAULT_MODEL = "google/t5-small"
+
+def default_threads() -> int:
+    """Intra-op threads for CPU generation: roughly the physical cores, since SMT siblings slow GEMMs down."""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+class HintModel:
+    """T5 hint generator that loads in the background and generates hints in padded batches.
+
+    Nothing is imported until load() (or preload(), which runs load() on a
+    daemon thread). With quantize=True the Linear layers are converted to
+    int8 dynamic quantization, which is several times faster on CPU at a
+    small cost in hint quality. generate() sorts prompts by length so each
+    batch pads as little as possible, runs one greedy generate() per batch
+    and records per-request latency.
+    """
+    def __init__(self, model_name: str = DEFAULT_MODEL, quantize: bool = False,
+                 num_threads: Union[int, None] = None, max_new_tokens: int = 100, batch_size: int = 16):
+        self.model_name = model_name
+        self.quantize = quantize
+        self.num_threads = num_threads or default_threads()
+        self.max_new_tokens = max_new_tokens
+        self.batch_size = batch_size
+        self.model = None
+        self.tokenizer = None
+        self.torch = None
+        self.load_seconds = None
+        self.load_error = None
+        self._lock = threading.Lock()
+        self._loader = None
+        self.requests = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.last_latencies: List[float] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def generation_params(self) -> dict:
+        """Settings that change the generated text (model, quantization, decoding)."""
+        return {"model": self.model_name, "quantize": self.quantize, "max_new_tokens": self.max_new_tokens,
+                "num_beams": 1}
+
+    def load(self):
+        """Imports torch/transformers and loads the model once; safe to call from several threads."""
+        with self._lock:
+            if self.model is not None:
+                return
+            start = time.perf_counter()
+            try:
+                # Lazy imports to prevent startup crashes due to DLL errors
+                import torch
+                from transformers import T5ForConditionalGeneration, T5Tokenizer
+                torch.set_num_threads(self.num_threads)
+                tokenizer = T5Tokenizer.from_pretrained(self.model_name)
+                model = T5ForConditionalGeneration.from_pretrained(self.model_name)
+                model.eval()
+                if self.quantize:
+                    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            except Exception as e:
+                self.load_error = str(e)
+                raise RuntimeError(f"AI Initialization Failed: {str(e)}")
+            self.torch, self.tokenizer, self.model = torch, tokenizer, model
+            self.load_error = None
+            self.load_seconds = time.perf_counter() - start
+
+    def preload(self) -> threading.Thread:
+        """Starts load() on a daemon thread (once) and returns that thread; failures are kept in load_error."""
+        with self._lock:
+            if self._loader is None:
+                def load_quietly():
+                    try:
+                        self.load()
+                    except RuntimeError:
+                        pass
+                self._loader = threading.Thread(target=load_quietly, name="hint-model", daemon=True)
+                self._loader.start()
+            return self._loader
+
+    def generate(self, expressions: List[str]) -> List[str]:
+        """Returns one hint per expression, in input order."""
+        self.load()
+        start = time.perf_counter()
+        prompts = [HINT_PROMPT.format(expression) for expression in expressions]
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        hints: List[Union[str, None]] = [None] * len(prompts)
+        latencies = [0.0] * len(prompts)
+        for begin in range(0, len(order), self.batch_size):
+            batch = order[begin:begin + self.batch_size]
+            inputs = self.tokenizer([prompts[i] for i in batch], return_tensors="pt", padding=True)
+            with self.torch.inference_mode():
+                outputs = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens, num_beams=1)
+            decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            done = time.perf_counter() - start
+            for i, hint in zip(batch, decoded):
+                hints[i] = hint
+                latencies[i] = done
+            self.batches += 1
+        self.requests += len(prompts)
+        self.total_latency += sum(latencies)
+        self.last_latencies = latencies
+        return hints
+
+    def info(self) -> dict:
+        return {
+            "model": self.model_name,
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "load_error": self.load_error,
+            "quantized": self.quantize,
+            "threads": self.num_threads,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_latency": self.total_latency / self.requests if self.requests else None,
+            "last_latencies": list(self.last_latencies),
+        }
@@ -0,0 +1,272 @@
+import json
+import math
+import os
+import sys
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Holds an exclusive inter-process lock on a sidecar lock file."""
+    with open(lock_path, 'a+') as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+class HistoryIndex:
+    """In-memory inverted index over history entries keyed by sequence number.
+
+    Entries are indexed by type, by the character trigrams of their
+    expression and by time (a list of (time, seq) pairs kept sorted, so a
+    time range is found by bisection), so filtered queries only touch
+    candidate entries instead of scanning the whole history.
+    """
+    def __init__(self):
+        self.by_seq: Dict[int, dict] = {}
+        self.by_type: Dict[str, Set[int]] = {}
+        self.by_trigram: Dict[str, Set[int]] = {}
+        self.by_time: List[Tuple[float, int]] = []
+
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _time(entry: dict) -> Union[float, None]:
+        moment = entry.get("time")
+        if isinstance(moment, (int, float)) and not isinstance(moment, bool) and moment == moment:
+            return moment
+        return None
+
+    def add(self, seq: int, entry: dict):
+        self.by_seq[seq] = entry
+        self.by_type.setdefault(entry.get("type"), set()).add(seq)
+        for gram in self._trigrams(str(entry.get("expression", ""))):
+            self.by_trigram.setdefault(gram, set()).add(seq)
+        moment = self._time(entry)
+        if moment is not None:
+            # Entries usually arrive in time order, so this is an append
+            insort(self.by_time, (moment, seq))
+
+    def remove(self, seq: int):
+        entry = self.by_seq.pop(seq, None)
+        if entry is None:
+            return
+        self._discard(self.by_type, entry.get("type"), seq)
+        for gram in self._trigrams(str(entry.get("expression", ""))):
+            self._discard(self.by_trigram, gram, seq)
+        moment = self._time(entry)
+        if moment is not None:
+            i = bisect_left(self.by_time, (moment, seq))
+            if i < len(self.by_time) and self.by_time[i] == (moment, seq):
+                del self.by_time[i]
+
+    @staticmethod
+    def _discard(index: dict, key, seq: int):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(seq)
+            if not bucket:
+                del index[key]
+
+    def clear(self):
+        self.by_seq.clear()
+        self.by_type.clear()
+        self.by_trigram.clear()
+        self.by_time.clear()
+
+    def candidates(self, types: Union[Set[str], None], text: Union[str, None], since: Union[float, None] = None,
+                   until: Union[float, None] = None) -> Union[Set[int], None]:
+        """Returns the sequence numbers that may match, or None when no index applies.
+
+        Time bounds are exact: entries outside [since, until] or without a time are never returned.
+        """
+        sets = []
+        if types is not None:
+            sets.append(set().union(*(self.by_type.get(t, set()) for t in types)))
+        if text and len(text) >= 3:
+            sets.extend(self.by_trigram.get(gram, set()) for gram in self._trigrams(text))
+        if since is not None or until is not None:
+            lo = 0 if since is None else bisect_left(self.by_time, (since,))
+            hi = len(self.by_time) if until is None else bisect_right(self.by_time, (until, math.inf))
+            sets.append({seq for _, seq in self.by_time[lo:hi]})
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+class HistoryStore:
+    """Append-only JSONL history log with a bounded in-memory view.
+
+    Every entry is one JSON line appended under an inter-process lock, so the
+    cost of a write does not depend on the history size and several app
+    instances can share one file. The file is compacted down to the newest
+    `limit` entries once it holds `compact_factor` times that many lines.
+    A path of None keeps the history in memory only. All methods are
+    thread-safe.
+    """
+    def __init__(self, path: Union[str, None] = "history_log.jsonl", limit: int = 10000,
+                 compact_factor: float = 2.0, legacy_path: Union[str, None] = None):
+        self.path = path
+        self.limit = limit
+        self.compact_factor = compact_factor
+        self.entries = deque(maxlen=limit)
+        self.index = HistoryIndex()
+        self._lock = threading.RLock()
+        self._first_seq = 0
+        self._disk_lines = 0
+        if path and legacy_path and not os.path.exists(path) and os.path.exists(legacy_path):
+            self._migrate(legacy_path)
+        self.load()
+
+    @property
+    def lock_path(self) -> str:
+        return self.path + ".lock"
+
+    def load(self):
+        """Reloads the newest `limit` entries from disk, skipping torn or corrupt lines."""
+        with self._lock:
+            self._reset()
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._disk_lines += 1
+                        try:
+                            self._push(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                pass
+
+    def append(self, entry: dict):
+        self.extend([entry])
+
+    def extend(self, entries: Iterable[dict]):
+        """Appends entries to memory and to the log in a single write."""
+        with self._lock:
+            entries = list(entries)
+            if not entries:
+                return
+            for entry in entries:
+                self._push(entry)
+            if not self.path:
+                return
+            payload = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+            try:
+                with _file_lock(self.lock_path):
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(payload)
+                self._disk_lines += len(entries)
+                if self._disk_lines > self.limit * self.compact_factor:
+                    self.compact()
+            except OSError:
+                pass
+
+    def compact(self):
+        """Rewrites the log keeping only the newest `limit` entries, including other instances' appends."""
+        with self._lock:
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with _file_lock(self.lock_path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        tail = deque((line for line in f if line.strip()), maxlen=self.limit)
+                    tmp_path = self.path + ".tmp"
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        f.writelines(tail)
+                    os.replace(tmp_path, self.path)
+                self._disk_lines = len(tail)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Forgets all entries in memory and on disk."""
+        with self._lock:
+            self._reset()
+            if self.path and os.path.exists(self.path):
+                with _file_lock(self.lock_path):
+                    open(self.path, 'w').close()
+
+    def _reset(self):
+        # Sequence numbers keep increasing so cursors from before a reload never alias new entries
+        self._first_seq += len(self.entries)
+        self.entries.clear()
+        self.index.clear()
+        self._disk_lines = 0
+
+    def _push(self, entry: dict):
+        """Appends one entry to the in-memory view, evicting and unindexing the oldest at the limit."""
+        if len(self.entries) == self.entries.maxlen:
+            self.entries.popleft()
+            self.index.remove(self._first_seq)
+            self._first_seq += 1
+        self.entries.append(entry)
+        self.index.add(self._first_seq + len(self.entries) - 1, entry)
+
+    def query(self, types: Union[str, Iterable[str], None] = None, since: Union[float, None] = None,
+              until: Union[float, None] = None, contains: Union[str, None] = None,
+              prefix: Union[str, None] = None, cursor: Union[int, None] = None, limit: int = 50) -> dict:
+        """Returns newest-first matching entries and the cursor of the next page (None when exhausted)."""
+        with self._lock:
+            if isinstance(types, str):
+                types = {types}
+            elif types is not None:
+                types = set(types)
+            text = max((t for t in (contains, prefix) if t), key=len, default=None)
+            candidates = self.index.candidates(types, text, since, until)
+            end = self._first_seq + len(self.entries)
+            if cursor is not None:
+                end = min(end, cursor)
+            if candidates is None:
+                seqs = range(end - 1, self._first_seq - 1, -1)
+            else:
+                seqs = sorted((seq for seq in candidates if seq < end), reverse=True)
+
+            items = []
+            next_cursor = None
+            for seq in seqs:
+                entry = self.index.by_seq[seq]
+                expression = str(entry.get("expression", ""))
+                if contains and contains not in expression:
+                    continue
+                if prefix and not expression.startswith(prefix):
+                    continue
+                if len(items) == limit:
+                    next_cursor = seq + 1
+                    break
+                items.append(entry)
+            return {"items": items, "next_cursor": next_cursor}
+
+    def _migrate(self, legacy_path: str):
+        """Imports a pre-JSONL history_log.json array once."""
+        try:
+            with open(legacy_path, 'r') as f:
+                legacy: List[dict] = json.load(f)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry, default=str) + "\n" for entry in legacy[-self.limit:])
+        except (OSError, ValueError):
+            pass
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
@@ -0,0 +1,35 @@
+import importlib
+import threading
+import types
+from typing import Iterable
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access.
+
+    Once loaded, the real module's namespace is copied in, so later lookups
+    are plain attribute reads. Loading goes through importlib.import_module,
+    which is safe to race from several threads (e.g. a prewarm thread and the
+    first real operation).
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+def prewarm(names: Iterable[str]) -> threading.Thread:
+    """Imports the named modules on a daemon thread and returns the (started) thread."""
+    def load():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+    thread = threading.Thread(target=load, name="prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,53 @@
+import numpy as np
+import sympy as sp
+from sympy.polys.matrices import DomainMatrix
+from typing import Dict, Sequence, Tuple, Union
+
+def eliminate(A: sp.Matrix, b: sp.Matrix, symbols: Sequence[sp.Symbol]) -> Tuple[Union[Dict, None], int]:
+    """Solves A x = b by fraction-free Gauss-Jordan elimination over the coefficient domain.
+
+    Returns ({pivot_symbol: value}, rank), or (None, rank) when the system is
+    inconsistent. In an underdetermined system the pivot variables are
+    expressed in terms of the remaining (free) symbols.
+    """
+    n = A.cols
+    reduced, den, pivots = DomainMatrix.from_Matrix(A.row_join(b)).rref_den()
+    if n in pivots:
+        return None, len(pivots) - 1
+    rows = reduced.to_Matrix()
+    den = reduced.domain.to_sympy(den)
+    free = [j for j in range(n) if j not in pivots]
+    solution = {}
+    for i, p in enumerate(pivots):
+        value = rows[i, n] - sum((rows[i, j] * symbols[j] for j in free), sp.S.Zero)
+        solution[symbols[p]] = value / den
+    return solution, len(pivots)
+
+def solve_numeric(A: sp.Matrix, b: sp.Matrix, symbols: Sequence[sp.Symbol]) -> Tuple[Union[Dict, None], int]:
+    """Solves A x = b in floating point: LU for square systems, least squares otherwise.
+
+    Returns the same (solution, rank) shape as eliminate(). Underdetermined
+    systems are reduced over floats so the free symbols stay symbolic.
+    """
+    try:
+        An = np.array(A.tolist(), dtype=float)
+        bn = np.array(b.tolist(), dtype=float).ravel()
+    except TypeError:
+        An = np.array(A.tolist(), dtype=complex)
+        bn = np.array(b.tolist(), dtype=complex).ravel()
+    m, n = An.shape
+    if m == n:
+        try:
+            x = np.linalg.solve(An, bn)
+            if np.all(np.isfinite(x)):
+                return dict(zip(symbols, x.tolist())), n
+        except np.linalg.LinAlgError:
+            pass
+    rank = int(np.linalg.matrix_rank(An))
+    if np.linalg.matrix_rank(np.column_stack([An, bn])) > rank:
+        return None, rank
+    if rank == n:
+        x = np.linalg.lstsq(An, bn, rcond=None)[0]
+        return dict(zip(symbols, x.tolist())), rank
+    solution, _ = eliminate(A.evalf(), b.evalf(), symbols)
+    return solution, rank
@@ -0,0 +1,200 @@
+import numpy as np
+from typing import Tuple, Union
+
+# Structures detect_structure can report, from most to least specialised
+STRUCTURES = ("diagonal", "upper", "lower", "hermitian", "banded", "general")
+
+# Banded elimination loops over rows in Python; measured faster than np.linalg.solve from about n = 1500
+BANDED_MIN_SIZE = 2048
+BANDED_MAX_FRACTION = 1 / 16
+# Rows per block of triangular_solve; each block is one small LAPACK solve plus one matmul update
+TRIANGULAR_BLOCK = 64
+
+def bandwidths(a: np.ndarray) -> Tuple[int, int]:
+    """Returns the (lower, upper) bandwidth shared by every matrix in a (..., n, n) stack."""
+    nonzero = a != 0
+    if a.ndim > 2:
+        nonzero = nonzero.any(axis=tuple(range(a.ndim - 2)))
+    rows, cols = np.nonzero(nonzero)
+    if rows.size == 0:
+        return 0, 0
+    offsets = rows - cols
+    return int(max(offsets.max(), 0)), int(max(-offsets.min(), 0))
+
+def detect_structure(a: np.ndarray) -> Tuple[str, int, int]:
+    """Classifies a stack of square matrices as one of STRUCTURES, with its (lower, upper) bandwidth."""
+    n = a.shape[-1]
+    # Dense non-Hermitian stacks are recognised from their corners without scanning every element
+    corner_low, corner_high = a[..., n - 1, 0], a[..., 0, n - 1]
+    if n > 1 and np.any(corner_low != 0) and np.any(corner_high != 0) and np.any(corner_high != np.conj(corner_low)):
+        return "general", n - 1, n - 1
+    lower, upper = bandwidths(a)
+    if lower == 0 and upper == 0:
+        return "diagonal", lower, upper
+    if lower == 0:
+        return "upper", lower, upper
+    if upper == 0:
+        return "lower", lower, upper
+    if np.array_equal(a, np.conj(np.swapaxes(a, -1, -2))):
+        return "hermitian", lower, upper
+    if n >= BANDED_MIN_SIZE and lower + upper < n * BANDED_MAX_FRACTION:
+        return "banded", lower, upper
+    return "general", lower, upper
+
+def _diagonal(a: np.ndarray) -> np.ndarray:
+    return np.diagonal(a, axis1=-2, axis2=-1)
+
+def triangular_solve(a: np.ndarray, b: np.ndarray, lower: bool, block: int = TRIANGULAR_BLOCK) -> np.ndarray:
+    """Solves a x = b for triangular a (..., n, n) and b (..., n, k) by blocked substitution over the stack.
+
+    Each block of rows is solved with np.linalg.solve after subtracting the
+    already known part with one matmul, so the work is O(n^2 k) in BLAS calls
+    rather than the O(n^3) of a full LU factorization.
+    """
+    n = a.shape[-1]
+    if np.any(_diagonal(a) == 0):
+        raise np.linalg.LinAlgError("Singular matrix")
+    x = np.zeros(np.broadcast_shapes(a.shape[:-2], b.shape[:-2]) + b.shape[-2:],
+                 dtype=np.result_type(a, b, float))
+    starts = range(0, n, block) if lower else range((n - 1) // block * block, -1, -block)
+    for i in starts:
+        j = min(i + block, n)
+        rhs = b[..., i:j, :]
+        if lower and i:
+            rhs = rhs - a[..., i:j, :i] @ x[..., :i, :]
+        elif not lower and j < n:
+            rhs = rhs - a[..., i:j, j:] @ x[..., j:, :]
+        x[..., i:j, :] = np.linalg.solve(a[..., i:j, i:j], rhs)
+    return x
+
+def banded_solve(a: np.ndarray, b: np.ndarray, lower: int, upper: int) -> np.ndarray:
+    """Solves a x = b for banded a by Gaussian elimination with partial pivoting restricted to the band.
+
+    Costs O(n * lower * (lower + upper)) per right-hand side instead of O(n^3).
+    """
+    n = a.shape[-1]
+    shape = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    dtype = np.result_type(a, b, float)
+    m = np.broadcast_to(a, shape + a.shape[-2:]).reshape(-1, n, n).astype(dtype)
+    rhs = np.broadcast_to(b, shape + b.shape[-2:]).reshape(-1, n, b.shape[-1]).astype(dtype)
+    batch = np.arange(m.shape[0])
+    # Row swaps can push the upper bandwidth up to lower + upper
+    width = lower + upper
+    for k in range(n):
+        last = min(n, k + lower + 1)
+        cols = slice(k, min(n, k + width + 1))
+        pivot = k + np.argmax(np.abs(m[:, k:last, k]), axis=1)
+        if np.any(m[batch, pivot, k] == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+        m[batch, k, cols], m[batch, pivot, cols] = m[batch, pivot, cols], m[batch, k, cols]
+        rhs[batch, k], rhs[batch, pivot] = rhs[batch, pivot], rhs[batch, k]
+        if last > k + 1:
+            factors = m[:, k + 1:last, k] / m[:, k, k, None]
+            m[:, k + 1:last, cols] -= factors[..., None] * m[:, k, None, cols]
+            rhs[:, k + 1:last] -= factors[..., None] * rhs[:, k, None, :]
+    x = np.zeros_like(rhs)
+    for k in range(n - 1, -1, -1):
+        end = min(n, k + width + 1)
+        partial = np.einsum('bj,bjk->bk', m[:, k, k + 1:end], x[:, k + 1:end])
+        x[:, k] = (rhs[:, k] - partial) / m[:, k, k, None]
+    return x.reshape(shape + b.shape[-2:])
+
+def solve(a: np.ndarray, b: np.ndarray, structure: Union[Tuple[str, int, int], None] = None) -> np.ndarray:
+    """Solves a x = b without forming an inverse; b may be (..., n) vectors or (..., n, k) matrices."""
+    vector = b.ndim == a.ndim - 1
+    rhs = b[..., None] if vector else b
+    name, lower, upper = structure or detect_structure(a)
+    if name == "diagonal":
+        diagonal = _diagonal(a)
+        if np.any(diagonal == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+        x = rhs / diagonal[..., None]
+    elif name in ("upper", "lower"):
+        x = triangular_solve(a, rhs, lower=name == "lower")
+    elif name == "banded":
+        x = banded_solve(a, rhs, lower, upper)
+    else:
+        x = np.linalg.solve(a, rhs)
+    return x[..., 0] if vector else x
+
+def det(a: np.ndarray, structure: Union[Tuple[str, int, int], None] = None) -> np.ndarray:
+    name = (structure or detect_structure(a))[0]
+    if name in ("diagonal", "upper", "lower"):
+        return np.prod(_diagonal(a), axis=-1)
+    return np.linalg.det(a)
+
+def inv(a: np.ndarray, structure: Union[Tuple[str, int, int], None] = None) -> np.ndarray:
+    structure = structure or detect_structure(a)
+    if structure[0] == "general" or structure[0] == "hermitian":
+        return np.linalg.inv(a)
+    identity = np.broadcast_to(np.eye(a.shape[-1], dtype=a.dtype), a.shape)
+    return solve(a, identity, structure)
+
+def eig(a: np.ndarray, structure: Union[Tuple[str, int, int], None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (eigenvalues, eigenvectors), using eigh for Hermitian stacks and reading diagonal ones directly."""
+    name = (structure or detect_structure(a))[0]
+    if name == "diagonal":
+        return _diagonal(a).copy(), np.broadcast_to(np.eye(a.shape[-1], dtype=a.dtype), a.shape).copy()
+    if name == "hermitian":
+        values, vectors = np.linalg.eigh(a)
+        return values, vectors
+    values, vectors = np.linalg.eig(a)
+    return values, vectors
+
+def _is_diagonal(a: np.ndarray) -> bool:
+    """Cheap check for a diagonal stack: one corner probe, then a nonzero count (no index arrays or copies)."""
+    n = a.shape[-1]
+    if n > 1 and (np.any(a[..., 0, n - 1] != 0) or np.any(a[..., n - 1, 0] != 0)):
+        return False
+    return np.count_nonzero(a) == np.count_nonzero(_diagonal(a))
+
+def multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Batched matrix product; a diagonal left operand only scales the rows of b."""
+    if a.ndim >= 2 and a.shape[-1] == a.shape[-2] and b.ndim >= 2 and _is_diagonal(a):
+        return _diagonal(a)[..., :, None] * b
+    return np.matmul(a, b)
+
+def open_npy(source: Union[str, np.ndarray]) -> np.ndarray:
+    """Opens a .npy path as a read-only memmap; arrays are returned unchanged."""
+    return np.load(source, mmap_mode='r') if isinstance(source, str) else source
+
+def blocked_matmul(a: np.ndarray, b: np.ndarray, out: Union[str, np.ndarray],
+                   block_size: int = 1024, workers: int = 1) -> np.ndarray:
+    """Multiplies two 2D (typically memory-mapped) matrices tile by tile into `out`.
+
+    `out` is an existing array/memmap of shape (m, p) or a .npy path that is
+    created as a memmap. Only three block_size x block_size tiles per worker are
+    held in memory, so the operands and result may be far larger than RAM.
+    Output tiles are independent, so with workers > 1 they are computed on a
+    thread pool (NumPy releases the GIL inside matmul).
+    """
+    if a.ndim != 2 or b.ndim != 2 or a.shape[1] != b.shape[0]:
+        raise ValueError(f"Cannot multiply shapes {a.shape} and {b.shape}")
+    m, n = a.shape
+    p = b.shape[1]
+    dtype = np.result_type(a.dtype, b.dtype)
+    if isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(m, p))
+    elif out.shape != (m, p):
+        raise ValueError(f"out has shape {out.shape}, expected {(m, p)}")
+
+    def tile(i: int, j: int):
+        rows, cols = slice(i, min(i + block_size, m)), slice(j, min(j + block_size, p))
+        acc = np.zeros((rows.stop - i, cols.stop - j), dtype=dtype)
+        for k in range(0, n, block_size):
+            inner = slice(k, min(k + block_size, n))
+            acc += np.asarray(a[rows, inner]) @ np.asarray(b[inner, cols])
+        out[rows, cols] = acc
+
+    tiles = [(i, j) for i in range(0, m, block_size) for j in range(0, p, block_size)]
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(lambda ij: tile(*ij), tiles):
+                pass
+    else:
+        for i, j in tiles:
+            tile(i, j)
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
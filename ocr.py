@@ -0,0 +1,176 @@
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, Tuple, Union
+import numpy as np
+
+# Files picked up when a directory is scanned
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif", ".webp")
+# Tesseract is most accurate around 300 DPI; higher resolutions only cost time
+TARGET_DPI = 300
+# Without DPI metadata, images whose longer side exceeds this are scaled down
+MAX_SIDE = 3500
+# Skew angles (degrees) searched by estimate_skew
+MAX_SKEW = 5.0
+SKEW_STEP = 0.25
+# Bumped whenever preprocessing changes, so cached text from older pipelines is not reused
+PREPROCESS_VERSION = "1"
+
+def to_grayscale(image: np.ndarray) -> np.ndarray:
+    """Converts (h, w), (h, w, 3) or (h, w, 4) pixel data to float luma in [0, 255]."""
+    image = np.asarray(image, dtype=np.float32)
+    if image.ndim == 2:
+        return image
+    return image[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def downscale(gray: np.ndarray, factor: int) -> np.ndarray:
+    """Shrinks by an integer factor, averaging each factor x factor block."""
+    if factor <= 1:
+        return gray
+    h, w = (gray.shape[0] // factor) * factor, (gray.shape[1] // factor) * factor
+    return gray[:h, :w].reshape(h // factor, factor, w // factor, factor).mean(axis=(1, 3))
+
+def otsu_threshold(gray: np.ndarray) -> float:
+    """Returns the threshold that maximizes the between-class variance of the 256-bin histogram."""
+    counts = np.bincount(np.clip(gray, 0, 255).astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight = np.cumsum(counts)
+    mass = np.cumsum(counts * levels)
+    total, total_mass = weight[-1], mass[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_low = mass / weight
+        mean_high = (total_mass - mass) / (total - weight)
+        between = weight * (total - weight) * (mean_low - mean_high) ** 2
+    return float(np.argmax(np.nan_to_num(between)))
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    """Returns a uint8 image with dark text (0) on white (255), inverting light-on-dark scans."""
+    ink = gray <= otsu_threshold(gray)
+    if ink.mean() > 0.5:
+        ink = ~ink
+    return np.where(ink, 0, 255).astype(np.uint8)
+
+def estimate_skew(binary: np.ndarray, max_angle: float = MAX_SKEW, step: float = SKEW_STEP,
+                  max_samples: int = 200000) -> float:
+    """Estimates the text-line angle in degrees by maximizing the sharpness of the row projection profile."""
+    ys, xs = np.nonzero(binary == 0)
+    if ys.size < 2:
+        return 0.0
+    if ys.size > max_samples:
+        pick = np.random.default_rng(0).choice(ys.size, max_samples, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    xs = xs - binary.shape[1] / 2
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        score = float(np.sum(np.bincount(rows - rows.min()).astype(np.float64) ** 2))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+def deskew(binary: np.ndarray, angle: float) -> np.ndarray:
+    """Straightens text lines by shearing each column vertically (a close stand-in for rotation at small angles)."""
+    if angle == 0:
+        return binary
+    h, w = binary.shape
+    shift = np.round((np.arange(w) - w / 2) * np.tan(np.radians(angle))).astype(np.int64)
+    source = np.arange(h)[:, None] + shift[None, :]
+    inside = (source >= 0) & (source < h)
+    out = np.full_like(binary, 255)
+    out[inside] = binary[source[inside], np.nonzero(inside)[1]]
+    return out
+
+def preprocess(image: np.ndarray, dpi: Union[float, None] = None) -> np.ndarray:
+    """Grayscale, downscale to about TARGET_DPI, binarize and deskew pixel data for Tesseract."""
+    gray = to_grayscale(image)
+    if dpi:
+        factor = int(dpi // TARGET_DPI)
+    else:
+        factor = -(-max(gray.shape) // MAX_SIDE)
+    gray = downscale(gray, factor)
+    binary = binarize(gray)
+    return deskew(binary, estimate_skew(binary))
+
+def content_key(path: str, config: str = "", preprocessed: bool = True) -> str:
+    """Hashes the file's bytes with the OCR settings, so renamed or copied scans share one cache entry."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(f"\0{config}\0{PREPROCESS_VERSION if preprocessed else 'raw'}".encode("utf-8"))
+    return digest.hexdigest()
+
+def recognize(path: str, config: str = "", preprocessed: bool = True) -> str:
+    """Runs Tesseract on one image file and returns its text on a single line."""
+    import pytesseract
+    from PIL import Image
+    with Image.open(path) as img:
+        if preprocessed:
+            dpi = img.info.get("dpi")
+            pixels = np.asarray(img if img.mode in ("L", "RGB", "RGBA") else img.convert("RGB"))
+            img = Image.fromarray(preprocess(pixels, dpi[0] if dpi else None))
+        text = pytesseract.image_to_string(img, config=config)
+    return text.replace('\n', ' ').strip()
+
+def _init_worker():
+    # One Tesseract thread per process; the pool already provides the parallelism
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+def _recognize_or_error(path: str, config: str, preprocessed: bool) -> str:
+    try:
+        return recognize(path, config, preprocessed)
+    except Exception as e:
+        return f"OCR Error: {str(e)}"
+
+def iter_images(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yields image paths from a directory (recursively, in sorted order), a single file, or a list of paths."""
+    if isinstance(source, str):
+        if not os.path.isdir(source):
+            yield source
+            return
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(root, name)
+        return
+    yield from source
+
+def ocr_batch(source: Union[str, Iterable[str]], workers: Union[int, None] = None, cache=None,
+              config: str = "", preprocessed: bool = True) -> Iterator[Tuple[str, str]]:
+    """Yields (path, text) for every image as soon as it is recognized, in completion order.
+
+    `cache` is a SymbolicCache-like store (get/put by key); images whose
+    content hash is cached are yielded immediately without touching the pool.
+    At most 2 * workers images are in flight, so arbitrarily large folders
+    stream with bounded memory. Failures yield "OCR Error: ..." text and are
+    not cached.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = {}
+        for path in iter_images(source):
+            try:
+                key = content_key(path, config, preprocessed) if cache is not None else None
+            except OSError as e:
+                yield path, f"OCR Error: {str(e)}"
+                continue
+            if key is not None:
+                text = cache.get(key)
+                if text is not None:
+                    yield path, text
+                    continue
+            pending[pool.submit(_recognize_or_error, path, config, preprocessed)] = (path, key)
+            while len(pending) >= 2 * workers:
+                yield from _collect(pending, cache)
+        while pending:
+            yield from _collect(pending, cache)
+
+def _collect(pending: dict, cache) -> Iterator[Tuple[str, str]]:
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        path, key = pending.pop(future)
+        text = future.result()
+        if key is not None and not text.startswith("OCR Error"):
+            cache.put(key, "ocr", text)
+        yield path, text
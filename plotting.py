@@ -0,0 +1,130 @@
+import io
+import numpy as np
+from typing import Callable, Tuple, Union
+
+def safe_evaluate(f: Callable, x: np.ndarray) -> np.ndarray:
+    """Evaluates a lambdified function over x, mapping domain errors and complex values to NaN."""
+    with np.errstate(all="ignore"):
+        try:
+            y = np.asarray(f(x))
+        except (ZeroDivisionError, ValueError, OverflowError):
+            # Scalar-only code paths; fall back to point-wise evaluation
+            y = np.array([_safe_point(f, value) for value in x])
+    y = np.broadcast_to(y, x.shape)
+    if np.iscomplexobj(y):
+        y = np.where(np.abs(y.imag) <= 1e-12 * np.maximum(1.0, np.abs(y.real)), y.real, np.nan)
+    return np.asarray(y, dtype=float)
+
+def _safe_point(f: Callable, value: float) -> complex:
+    try:
+        return complex(f(value))
+    except (ZeroDivisionError, ValueError, OverflowError, TypeError):
+        return complex(np.nan)
+
+def _robust_span(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """Returns the 2nd-98th percentile of y weighted by x-spacing, so poles and dense refinement do not set the scale."""
+    mask = np.isfinite(y)
+    if not mask.any():
+        return 0.0, 1.0
+    weights = np.gradient(x)[mask] if x.size > 1 else np.ones(1)
+    order = np.argsort(y[mask])
+    values = y[mask][order]
+    cumulative = np.cumsum(weights[order])
+    cumulative /= cumulative[-1]
+    low = values[min(np.searchsorted(cumulative, 0.02), values.size - 1)]
+    high = values[min(np.searchsorted(cumulative, 0.98), values.size - 1)]
+    if high - low <= 0:
+        low, high = low - 0.5, high + 0.5
+    return float(low), float(high)
+
+def adaptive_sample(f: Callable, x_min: float, x_max: float, initial: int = 65, max_points: int = 2000,
+                    max_passes: int = 10, tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """Samples f on [x_min, x_max], bisecting only intervals that are curved, steep or cross a domain edge.
+
+    Each pass evaluates the midpoints of the intervals still marked active in one
+    vectorized call. An interval stays active while its midpoint deviates from the
+    chord by more than `tol` times the visible y-range or while it straddles
+    finite and non-finite samples. Jumps larger than the visible range are split
+    with NaN so the line is not drawn across poles and discontinuities.
+    """
+    x = np.linspace(x_min, x_max, initial)
+    y = safe_evaluate(f, x)
+    active = np.ones(initial - 1, dtype=bool)
+    for _ in range(max_passes):
+        budget = max_points - x.size
+        if budget <= 0 or not active.any():
+            break
+        idx = np.flatnonzero(active)
+        mid = (x[idx] + x[idx + 1]) / 2
+        y_mid = safe_evaluate(f, mid)
+        low, high = _robust_span(x, y)
+        with np.errstate(invalid="ignore"):
+            error = np.abs(y_mid - (y[idx] + y[idx + 1]) / 2)
+        finite = np.isfinite(np.stack([y[idx], y[idx + 1], y_mid]))
+        straddles = finite.any(axis=0) & ~finite.all(axis=0)
+        refine = straddles | (np.nan_to_num(error, nan=0.0) > tol * (high - low))
+        if not refine.any():
+            break
+        if refine.sum() > budget:
+            # Spend the remaining budget on the worst intervals
+            score = np.where(straddles, np.inf, np.nan_to_num(error, nan=0.0))
+            keep = np.argsort(score)[::-1][:budget]
+            refine = np.zeros_like(refine)
+            refine[keep] = True
+        chosen = idx[refine]
+        x = np.insert(x, chosen + 1, mid[refine])
+        y = np.insert(y, chosen + 1, y_mid[refine])
+        # Both halves of every bisected interval are candidates for the next pass
+        active = np.zeros(x.size - 1, dtype=bool)
+        new_positions = chosen + 1 + np.arange(chosen.size)
+        active[new_positions - 1] = True
+        active[new_positions] = True
+
+    low, high = _robust_span(x, y)
+    with np.errstate(invalid="ignore"):
+        jumps = np.flatnonzero(np.abs(np.diff(y)) > (high - low))
+    if jumps.size:
+        x = np.insert(x, jumps + 1, (x[jumps] + x[jumps + 1]) / 2)
+        y = np.insert(y, jumps + 1, np.nan)
+    return x, y
+
+def render_plot(x: np.ndarray, y: np.ndarray, label: str, title: str, fmt: str = "rgba",
+                figsize: Tuple[float, float] = (8, 6), dpi: int = 100) -> Union[np.ndarray, bytes]:
+    """Draws a function plot on a private Agg canvas and returns an RGBA array or PNG bytes.
+
+    No pyplot state is touched, so this is safe to call from several threads.
+    matplotlib is imported here so that sampling and evaluation stay usable without it.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(x, y, label=label)
+    ax.axhline(0, color='black', lw=1)
+    ax.axvline(0, color='black', lw=1)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend()
+    ax.set_title(title)
+
+    finite = y[np.isfinite(y)]
+    if finite.size:
+        low, high = _robust_span(x, y)
+        # Poles would otherwise flatten the rest of the curve
+        if finite.max() - finite.min() > 10 * (high - low):
+            margin = 0.1 * (high - low)
+            ax.set_ylim(low - margin, high + margin)
+
+    if fmt == "png":
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encodes an RGBA array as PNG bytes."""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
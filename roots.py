@@ -0,0 +1,200 @@
+import numpy as np
+from plotting import safe_evaluate
+from typing import Callable, List, Sequence, Tuple
+
+def _polish(coeffs: np.ndarray, root: complex, multiplicity: int, steps: int = 4) -> complex:
+    """Newton-polishes a root of multiplicity m as a simple root of the (m-1)th derivative."""
+    target = coeffs
+    for _ in range(multiplicity - 1):
+        target = np.polyder(target)
+    slope = np.polyder(target)
+    if slope.size == 0:
+        return root
+    value = np.polyval(target, root)
+    for _ in range(steps):
+        derivative = np.polyval(slope, root)
+        if derivative == 0 or value == 0:
+            break
+        candidate = root - value / derivative
+        candidate_value = np.polyval(target, candidate)
+        if abs(candidate_value) >= abs(value):
+            break
+        root, value = candidate, candidate_value
+    return root
+
+def _is_multiple_root(coeffs: np.ndarray, root: complex, multiplicity: int, tol: float) -> bool:
+    """Checks that p and its first m-1 derivatives vanish at root relative to their coefficient scale."""
+    target = coeffs
+    for _ in range(multiplicity):
+        scale = np.polyval(np.abs(target), abs(root))
+        if scale and abs(np.polyval(target, root)) > tol * scale:
+            return False
+        target = np.polyder(target)
+    return True
+
+def _cluster(candidates: np.ndarray, tol: float) -> List[List[complex]]:
+    """Groups eigenvalue estimates that lie within a relative tolerance of each other."""
+    clusters: List[List[complex]] = []
+    for value in sorted(candidates, key=lambda z: (z.real, z.imag)):
+        for members in clusters:
+            centre = np.mean(members)
+            if abs(value - centre) <= tol * max(1.0, abs(centre)):
+                members.append(value)
+                break
+        else:
+            clusters.append([value])
+    return clusters
+
+def polynomial_roots(coeffs: Sequence[complex], cluster_tol: float = 1e-2,
+                     check_tol: float = 1e-10, real_tol: float = 1e-9) -> List[Tuple[complex, int]]:
+    """Returns (root, multiplicity) pairs of a polynomial given highest-degree-first coefficients.
+
+    Roots are companion-matrix eigenvalues (np.roots). Nearby eigenvalues, which is
+    how a multiple root shows up numerically, are merged and accepted as one root of
+    that multiplicity only if the derivatives vanish there too. Every root is then
+    Newton-polished against the original coefficients. Real or imaginary parts that
+    are negligible relative to the root's magnitude are dropped, so real roots come
+    back as floats; roots that then coincide are merged into one.
+    """
+    c = np.trim_zeros(np.asarray(coeffs, dtype=complex), 'f')
+    if c.size <= 1:
+        return []
+    stripped = np.trim_zeros(c, 'b')
+    zero_multiplicity = c.size - stripped.size
+    if np.all(stripped.imag == 0):
+        stripped = stripped.real
+
+    found: List[Tuple[complex, int]] = []
+    for members in _cluster(np.roots(stripped) if stripped.size > 1 else np.array([]), cluster_tol):
+        multiplicity = len(members)
+        root = _polish(stripped, complex(np.mean(members)), multiplicity)
+        if multiplicity > 1 and not _is_multiple_root(stripped, root, multiplicity, check_tol):
+            found.extend((_polish(stripped, complex(value), 1), 1) for value in members)
+        else:
+            found.append((root, multiplicity))
+    if zero_multiplicity:
+        found.append((0j, zero_multiplicity))
+
+    merged = {}
+    for root, multiplicity in found:
+        root = complex(root)
+        # Relative to the root itself, so tiny complex roots (x^2 + 1e-20) are not mistaken for real ones
+        if abs(root.imag) <= real_tol * abs(root):
+            root = float(root.real) + 0.0
+        elif abs(root.real) <= real_tol * abs(root):
+            root = complex(0.0, root.imag)
+        merged[root] = merged.get(root, 0) + multiplicity
+    return sorted(merged.items(), key=lambda item: (isinstance(item[0], complex), complex(item[0]).real, complex(item[0]).imag))
+
+def _brent(f: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+           xtol: float, max_iter: int = 100) -> float:
+    """Brent's method on a bracket [a, b] with f(a) and f(b) of opposite sign."""
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * np.finfo(float).eps * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation, or secant when only two points are distinct
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+    return b
+
+def _golden_minimum(f: Callable[[float], float], a: float, b: float, xtol: float, max_iter: int = 100) -> float:
+    """Golden-section search for the minimiser of f on [a, b]."""
+    ratio = (np.sqrt(5) - 1) / 2
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc, fd = f(c), f(d)
+    for _ in range(max_iter):
+        if b - a <= xtol * max(1.0, abs(a) + abs(b)):
+            break
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = f(d)
+    return c if fc < fd else d
+
+def real_roots(f: Callable, a: float, b: float, points: int = 2001,
+               xtol: float = 1e-12, ftol: float = 1e-10) -> List[float]:
+    """Returns the real roots of a vectorized function f on [a, b].
+
+    f is evaluated once on a uniform grid of `points` samples. Sign changes
+    between neighbouring samples are refined with Brent's method and kept only
+    if |f| actually shrinks there, which rejects poles. Local minima of |f|
+    without a sign change (even-multiplicity roots such as sin(x)**2) are
+    refined by golden-section search and kept if |f| falls below `ftol`.
+    A run of consecutive samples with |f| <= `ftol` (f flat or zero over an
+    interval, e.g. floor(x)) counts as one root at its smallest |f|; if every
+    finite sample is that small, f is identically zero on [a, b] and there are
+    no isolated roots to report. Roots closer together than the grid spacing
+    can be missed.
+    """
+    def scalar(value: float) -> float:
+        return float(safe_evaluate(f, np.array([value]))[0])
+
+    x = np.linspace(a, b, points)
+    y = safe_evaluate(f, x)
+    finite = np.isfinite(y)
+    small = finite & (np.abs(y) <= ftol)
+    if small.any() and np.all(small | ~finite):
+        return []
+    edges = np.diff(np.concatenate(([0], small.astype(np.int8), [0])))
+    flat = np.zeros(points, dtype=bool)
+    found = []
+    for start, stop in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        if stop - start > 1:
+            flat[start:stop] = True
+            found.append(x[start + np.argmin(np.abs(y[start:stop]))])
+        elif y[start] == 0:
+            found.append(x[start])
+
+    pair = finite[:-1] & finite[1:] & ~flat[:-1] & ~flat[1:]
+    for i in np.flatnonzero(pair & (np.sign(y[:-1]) * np.sign(y[1:]) < 0)):
+        root = _brent(scalar, x[i], x[i + 1], y[i], y[i + 1], xtol)
+        if abs(scalar(root)) <= min(abs(y[i]), abs(y[i + 1])):
+            found.append(root)
+
+    magnitude = np.where(finite, np.abs(y), np.inf)
+    interior = np.arange(1, points - 1)
+    touching = interior[(magnitude[interior] <= magnitude[interior - 1]) & (magnitude[interior] <= magnitude[interior + 1])
+                        & (y[interior] != 0) & ~flat[interior] & (np.sign(y[interior - 1]) == np.sign(y[interior]))
+                        & (np.sign(y[interior + 1]) == np.sign(y[interior]))]
+    for i in touching:
+        root = _golden_minimum(lambda value: abs(scalar(value)), x[i - 1], x[i + 1], xtol)
+        if abs(scalar(root)) <= ftol:
+            found.append(root)
+
+    roots: List[float] = []
+    for root in sorted(float(r) for r in found):
+        if not roots or root - roots[-1] > max(xtol, 1e-9 * max(1.0, abs(root))):
+            roots.append(root + 0.0)
+    return roots
@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Union
+from cli import DEFAULT_ANALYZE_FIELDS, to_json
+
+METHODS = ("evaluate", "solve", "analyze", "matrix", "plot")
+# Requests larger than this are rejected instead of buffered
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+_engine = None
+
+def _init_worker(engine_kwargs: dict):
+    global _engine
+    from engine import CalculatorEngine
+    _engine = CalculatorEngine(**engine_kwargs)
+
+def _check(result):
+    if isinstance(result, str) and result.startswith(("Error", "Export Error")):
+        raise ValueError(result)
+    return result
+
+def _dispatch(method: str, params: dict):
+    """Runs one request in a pool worker and returns its JSON-ready result; engine errors are raised."""
+    if method == "evaluate":
+        return to_json(_check(_engine.evaluate_expression(params["expression"])))
+    if method == "solve":
+        result = _engine.solve_equation(params["equation"], exact=params.get("exact"),
+                                        numeric=params.get("numeric", False))
+        if len(result) == 1 and isinstance(result[0], str):
+            raise ValueError(result[0])
+        return {"solutions": to_json(list(result)), "method": result.method, "approximate": result.approximate}
+    if method == "analyze":
+        fields = tuple(params.get("fields", DEFAULT_ANALYZE_FIELDS))
+        analysis = _engine.analyze_function(params["expression"], fields=fields,
+                                            x_range=tuple(params.get("x_range", (-10, 10))))
+        if "error" in analysis:
+            raise ValueError(analysis["error"])
+        values = {field: to_json(analysis[field]) for field in fields if field not in ("plot_png", "plot_image")}
+        if "plot_png" in fields:
+            values["plot_png"] = base64.b64encode(analysis["plot_png"]).decode("ascii")
+        return {"fields": values, "approximate": analysis["approximate"]}
+    if method == "matrix":
+        import numpy as np
+        matrices = [np.asarray(m) for m in params["matrices"]]
+        return to_json(_check(_engine.matrix_operations(params["op"], *matrices, structure=params.get("structure"))))
+    if method == "plot":
+        png = _check(_engine.render_function(params["expression"], tuple(params.get("x_range", (-10, 10)))))
+        return {"png": base64.b64encode(png).decode("ascii")}
+    raise ValueError(f"Unknown method '{method}'")
+
+class CalculatorServer:
+    """Line-delimited JSON-RPC server that runs engine calls on a warm process pool.
+
+    Each request is one JSON object per line, {"id", "method", "params"}, and
+    gets one response line, {"id", "result"} or {"id", "error"}; a connection
+    may pipeline requests and responses arrive as they complete. Identical
+    in-flight requests (same method and params) share one computation, and the
+    "stats" method reports request/coalescing/timeout counters. At most
+    `max_pending` requests are in flight server-wide; beyond that the server
+    stops reading from sockets, so clients see TCP backpressure instead of an
+    unbounded queue. A request that outlives its timeout gets an error reply,
+    and the engine's own symbolic budget bounds how long the worker stays busy.
+    """
+    def __init__(self, workers: Union[int, None] = None, max_pending: int = 256, timeout: float = 30.0,
+                 engine_kwargs: Union[dict, None] = None):
+        self.timeout = timeout
+        self.max_pending = max_pending
+        # Symbolic work gives up (and falls back to numeric) before the client stops waiting
+        # No method hints or runs OCR, so those caches stay closed
+        self.engine_kwargs = {"record_history": False, "history_file": None, "symbolic_timeout": 0.8 * timeout,
+                              "hint_cache_file": None, "ocr_cache_file": None}
+        self.engine_kwargs.update(engine_kwargs or {})
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                                        initargs=(self.engine_kwargs,))
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+        self._slots = None
+
+    async def call(self, method: str, params: dict):
+        """Returns the result of method(params), joining an identical in-flight computation if there is one."""
+        if method == "stats":
+            return dict(self.stats, inflight=len(self.inflight))
+        if method not in METHODS:
+            raise ValueError(f"Unknown method '{method}'")
+        key = json.dumps([method, {k: v for k, v in params.items() if k != "timeout"}], sort_keys=True)
+        future = self.inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(self.pool, _dispatch, method, params))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded so one client's timeout does not cancel the work other clients are waiting on
+        return await asyncio.wait_for(asyncio.shield(future), params.get("timeout", self.timeout))
+
+    async def _respond(self, request_line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        request_id = None
+        try:
+            request = json.loads(request_line)
+            request_id = request.get("id")
+            response = {"id": request_id, "result": await self.call(request["method"], request.get("params", {}))}
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            response = {"id": request_id, "error": "Error: request timed out"}
+        except Exception as e:
+            self.stats["errors"] += 1
+            response = {"id": request_id, "error": str(e) if str(e).startswith("Error") else f"Error: {e}"}
+        finally:
+            self._slots.release()
+        async with lock:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                await self._slots.acquire()
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    self._slots.release()
+                    break
+                if not line:
+                    self._slots.release()
+                    break
+                if not line.strip():
+                    self._slots.release()
+                    continue
+                self.stats["requests"] += 1
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Union[str, None] = None):
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path, limit=MAX_REQUEST_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=MAX_REQUEST_BYTES)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve CalculatorEngine over line-delimited JSON-RPC.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests in flight before reads pause")
+    parser.add_argument("--timeout", type=float, default=30.0, help="default per-request timeout in seconds")
+    args = parser.parse_args(argv)
+
+    server = CalculatorServer(args.workers, args.max_pending, args.timeout)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {', '.join(METHODS)} on {where}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
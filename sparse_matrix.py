@@ -0,0 +1,223 @@
+import numpy as np
+from typing import Tuple, Union
+
+class COOMatrix:
+    """Sparse matrix as (row, col, value) triplets; duplicates are summed on conversion to CSR."""
+    def __init__(self, rows, cols, data, shape: Tuple[int, int]):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.data = np.asarray(data)
+        self.shape = tuple(shape)
+
+    @property
+    def nnz(self) -> int:
+        return self.data.size
+
+    def tocsr(self) -> "CSRMatrix":
+        n_rows, n_cols = self.shape
+        keys = self.rows * n_cols + self.cols
+        order = np.argsort(keys, kind='stable')
+        keys, data = keys[order], self.data[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if keys.size else np.zeros(0, dtype=np.int64)
+        sums = np.add.reduceat(data, starts) if keys.size else data
+        keys = keys[starts]
+        keep = sums != 0
+        keys, sums = keys[keep], sums[keep]
+        rows, cols = np.divmod(keys, n_cols)
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return CSRMatrix(sums, cols, indptr, self.shape)
+
+    def toarray(self) -> np.ndarray:
+        return self.tocsr().toarray()
+
+class CSRMatrix:
+    """Compressed sparse row matrix on NumPy arrays; memory is O(nnz + rows).
+
+    Supports `A @ x` for vectors, dense matrices and other sparse matrices,
+    `A + B` with sparse or dense operands, and transpose().
+    """
+    # Make NumPy defer `x @ A` and `x + A` to the reflected methods below
+    __array_ufunc__ = None
+
+    def __init__(self, data, indices, indptr, shape: Tuple[int, int]):
+        self.data = np.asarray(data)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_dense(cls, dense) -> "CSRMatrix":
+        dense = np.asarray(dense)
+        rows, cols = np.nonzero(dense)
+        return COOMatrix(rows, cols, dense[rows, cols], dense.shape).tocsr()
+
+    @property
+    def nnz(self) -> int:
+        return self.data.size
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def _row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def tocoo(self) -> COOMatrix:
+        return COOMatrix(self._row_ids(), self.indices, self.data, self.shape)
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=self.dtype)
+        dense[self._row_ids(), self.indices] = self.data
+        return dense
+
+    def transpose(self) -> "CSRMatrix":
+        return COOMatrix(self.indices, self._row_ids(), self.data, self.shape[::-1]).tocsr()
+
+    @property
+    def T(self) -> "CSRMatrix":
+        return self.transpose()
+
+    def diagonal(self) -> np.ndarray:
+        rows = self._row_ids()
+        on_diagonal = rows == self.indices
+        diagonal = np.zeros(min(self.shape), dtype=self.dtype)
+        diagonal[rows[on_diagonal]] = self.data[on_diagonal]
+        return diagonal
+
+    def dot(self, other) -> Union[np.ndarray, "CSRMatrix"]:
+        if isinstance(other, COOMatrix):
+            other = other.tocsr()
+        if isinstance(other, CSRMatrix):
+            return self._dot_sparse(other)
+        other = np.asarray(other)
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(f"Cannot multiply shapes {self.shape} and {other.shape}")
+        dtype = np.result_type(self.dtype, other.dtype)
+        out = np.zeros((self.shape[0],) + other.shape[1:], dtype=dtype)
+        if self.nnz:
+            products = self.data.reshape((-1,) + (1,) * (other.ndim - 1)) * other[self.indices]
+            nonempty = np.flatnonzero(np.diff(self.indptr))
+            out[nonempty] = np.add.reduceat(products, self.indptr[nonempty], axis=0)
+        return out
+
+    def _dot_sparse(self, other: "CSRMatrix") -> "CSRMatrix":
+        """Sparse x sparse: expands every a_ij against row j of other, then sums duplicates."""
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(f"Cannot multiply shapes {self.shape} and {other.shape}")
+        starts = other.indptr[self.indices]
+        counts = other.indptr[self.indices + 1] - starts
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+        rows = np.repeat(self._row_ids(), counts)
+        data = np.repeat(self.data, counts) * other.data[offsets]
+        return COOMatrix(rows, other.indices[offsets], data, (self.shape[0], other.shape[1])).tocsr()
+
+    def __matmul__(self, other):
+        return self.dot(other)
+
+    def __rmatmul__(self, other):
+        # x @ A == (A^T @ x^T)^T
+        return self.transpose().dot(np.asarray(other).T).T
+
+    def __add__(self, other):
+        if isinstance(other, COOMatrix):
+            other = other.tocsr()
+        if isinstance(other, CSRMatrix):
+            if other.shape != self.shape:
+                raise ValueError(f"Cannot add shapes {self.shape} and {other.shape}")
+            a, b = self.tocoo(), other.tocoo()
+            return COOMatrix(np.r_[a.rows, b.rows], np.r_[a.cols, b.cols], np.r_[a.data, b.data], self.shape).tocsr()
+        dense = np.array(np.broadcast_to(other, self.shape), dtype=np.result_type(self.dtype, np.asarray(other).dtype))
+        np.add.at(dense, (self._row_ids(), self.indices), self.data)
+        return dense
+
+    __radd__ = __add__
+
+    def __repr__(self):
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz}, dtype={self.dtype})"
+
+def as_csr(matrix) -> CSRMatrix:
+    """Returns matrix as CSR, converting COO and dense inputs."""
+    if isinstance(matrix, CSRMatrix):
+        return matrix
+    if isinstance(matrix, COOMatrix):
+        return matrix.tocsr()
+    return CSRMatrix.from_dense(matrix)
+
+def conjugate_gradient(A, b, x0=None, tol: float = 1e-10, max_iter: Union[int, None] = None) -> Tuple[np.ndarray, dict]:
+    """Solves A x = b for Hermitian positive definite A (anything supporting A @ v); stops at ||r|| <= tol ||b||."""
+    b = np.asarray(b)
+    dtype = np.result_type(b.dtype, getattr(A, "dtype", float), float)
+    x = np.zeros(b.shape, dtype=dtype) if x0 is None else np.array(x0, dtype=dtype)
+    max_iter = 10 * b.shape[0] if max_iter is None else max_iter
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - A @ x
+    p = r.copy()
+    rho = np.vdot(r, r).real
+    iterations = 0
+    while np.sqrt(rho) > tol * b_norm and iterations < max_iter:
+        q = A @ p
+        alpha = rho / np.vdot(p, q).real
+        x += alpha * p
+        r -= alpha * q
+        rho, previous = np.vdot(r, r).real, rho
+        p = r + (rho / previous) * p
+        iterations += 1
+    residual = float(np.sqrt(rho) / b_norm)
+    return x, {"iterations": iterations, "residual": residual, "converged": residual <= tol}
+
+def gmres(A, b, x0=None, tol: float = 1e-10, restart: int = 50, max_iter: Union[int, None] = None) -> Tuple[np.ndarray, dict]:
+    """Restarted GMRES for general square A (anything supporting A @ v); stops at ||r|| <= tol ||b||."""
+    b = np.asarray(b)
+    n = b.shape[0]
+    dtype = np.result_type(b.dtype, getattr(A, "dtype", float), float)
+    x = np.zeros(n, dtype=dtype) if x0 is None else np.array(x0, dtype=dtype)
+    max_iter = 10 * n if max_iter is None else max_iter
+    restart = min(restart, n)
+    b_norm = np.linalg.norm(b) or 1.0
+    iterations = 0
+    residual = np.linalg.norm(b - A @ x) / b_norm
+    while residual > tol and iterations < max_iter:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        V = np.zeros((restart + 1, n), dtype=dtype)
+        H = np.zeros((restart + 1, restart), dtype=dtype)
+        cs = np.zeros(restart)
+        sn = np.zeros(restart, dtype=dtype)
+        g = np.zeros(restart + 1, dtype=dtype)
+        V[0] = r / beta
+        g[0] = beta
+        k = 0
+        while k < restart and iterations < max_iter:
+            w = A @ V[k]
+            # Classical Gram-Schmidt, applied twice for stability
+            for _ in range(2):
+                h = V[:k + 1].conj() @ w
+                w = w - h @ V[:k + 1]
+                H[:k + 1, k] += h
+            H[k + 1, k] = np.linalg.norm(w)
+            breakdown = H[k + 1, k] == 0
+            if not breakdown:
+                V[k + 1] = w / H[k + 1, k]
+            for i in range(k):
+                H[i, k], H[i + 1, k] = (cs[i] * H[i, k] + sn[i] * H[i + 1, k],
+                                        -np.conj(sn[i]) * H[i, k] + cs[i] * H[i + 1, k])
+            a, c = H[k, k], H[k + 1, k]
+            norm = np.hypot(abs(a), abs(c))
+            cs[k], sn[k] = (abs(a) / norm, (a / abs(a)) * np.conj(c) / norm) if a != 0 else (0.0, 1.0)
+            H[k, k] = cs[k] * a + sn[k] * c
+            H[k + 1, k] = 0
+            g[k + 1] = -np.conj(sn[k]) * g[k]
+            g[k] = cs[k] * g[k]
+            k += 1
+            iterations += 1
+            if abs(g[k]) <= tol * b_norm or breakdown:
+                break
+        y = np.zeros(k, dtype=dtype)
+        for i in range(k - 1, -1, -1):
+            y[i] = (g[i] - H[i, i + 1:k] @ y[i + 1:]) / H[i, i]
+        x += y @ V[:k]
+        residual = np.linalg.norm(b - A @ x) / b_norm
+    residual = float(residual)
+    return x, {"iterations": iterations, "residual": residual, "converged": residual <= tol}
@@ -0,0 +1,245 @@
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any
+
+# Directory name of the per-user cache location
+APP_NAME = "sao-calculator"
+# SymPy packages whose Basic subclasses may be rebuilt from a cache entry
+ALLOWED_MODULES = ("sympy.core", "sympy.functions", "sympy.integrals", "sympy.logic", "sympy.sets",
+                   "sympy.polys", "sympy.series", "sympy.concrete", "sympy.calculus", "sympy.matrices")
+
+def cache_dir() -> str:
+    """Returns the per-user cache directory (LOCALAPPDATA, ~/Library/Caches or XDG_CACHE_HOME)."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_NAME)
+
+def default_cache_path(filename: str) -> str:
+    return os.path.join(cache_dir(), filename)
+
+def encode(value: Any) -> Any:
+    """Converts a result (SymPy objects, numbers, strings, containers) into JSON-ready data; raises TypeError otherwise."""
+    import sympy as sp
+    if value is None or isinstance(value, (bool, str, int, float)):
+        return value
+    if isinstance(value, complex):
+        return {"complex": [value.real, value.imag]}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return {type(value).__name__: [encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {"dict": [[encode(k), encode(v)] for k, v in value.items()]}
+    if isinstance(value, sp.MatrixBase) and not isinstance(value, sp.Basic):
+        return {"matrix": [[encode(item) for item in row] for row in value.tolist()]}
+    if not isinstance(value, sp.Basic):
+        raise TypeError(f"cannot cache {type(value).__name__}")
+    if type(value) in (sp.Symbol, sp.Dummy):
+        assumptions = getattr(value, "_assumptions_orig", None) or {}
+        encoded = {"symbol": value.name, "assumptions": dict(assumptions)}
+        if type(value) is sp.Dummy:
+            encoded["dummy"] = value.dummy_index
+        return encoded
+    if isinstance(value, sp.Symbol):
+        raise TypeError(f"cannot cache {type(value).__name__}")
+    if isinstance(value, sp.Integer):
+        return {"integer": int(value)}
+    if isinstance(value, sp.Rational):
+        return {"rational": [int(value.p), int(value.q)]}
+    if isinstance(value, sp.Float):
+        return {"float": [int(part) for part in value._mpf_], "prec": value._prec}
+    if isinstance(value, sp.core.function.AppliedUndef):
+        return {"undef": value.func.__name__, "args": [encode(arg) for arg in value.args]}
+    cls = type(value)
+    return {"type": f"{cls.__module__}:{cls.__qualname__}", "args": [encode(arg) for arg in value.args]}
+
+def decode(data: Any) -> Any:
+    """Rebuilds a value from encode() output.
+
+    Nothing is parsed or evaluated from text: nodes are rebuilt as cls(*args)
+    from Basic subclasses in ALLOWED_MODULES, every argument must itself be a
+    decoded SymPy object, and anything else raises ValueError.
+    """
+    import sympy as sp
+    if data is None or isinstance(data, (bool, str, int, float)):
+        return data
+    if not isinstance(data, dict) or len(data) not in (1, 2, 3):
+        raise ValueError("malformed cache entry")
+    if "complex" in data:
+        real, imag = data["complex"]
+        return complex(float(real), float(imag))
+    for name, container in (("list", list), ("tuple", tuple), ("set", set), ("frozenset", frozenset)):
+        if name in data:
+            return container(decode(item) for item in data[name])
+    if "dict" in data:
+        return {decode(k): decode(v) for k, v in data["dict"]}
+    if "matrix" in data:
+        return sp.Matrix([[_decode_basic(item) for item in row] for row in data["matrix"]])
+    return _decode_basic(data)
+
+def _decode_basic(data: Any):
+    import sympy as sp
+    if not isinstance(data, dict):
+        raise ValueError("expected a SymPy object")
+    if "symbol" in data:
+        name, assumptions = data["symbol"], data.get("assumptions", {})
+        if not isinstance(name, str) or not all(isinstance(k, str) and isinstance(v, bool)
+                                                for k, v in assumptions.items()):
+            raise ValueError("malformed symbol")
+        if "dummy" in data:
+            return sp.Dummy(name, dummy_index=int(data["dummy"]), **assumptions)
+        return sp.Symbol(name, **assumptions)
+    if "integer" in data:
+        return sp.Integer(int(data["integer"]))
+    if "rational" in data:
+        p, q = data["rational"]
+        return sp.Rational(int(p), int(q))
+    if "float" in data:
+        from mpmath.libmp import MPZ
+        sign, man, exp, bc = (int(part) for part in data["float"])
+        return sp.Float._new((sign, MPZ(man), exp, bc), int(data["prec"]))
+    args = [_decode_basic(arg) for arg in data.get("args", [])]
+    if "undef" in data:
+        if not isinstance(data["undef"], str):
+            raise ValueError("malformed function name")
+        return sp.Function(data["undef"])(*args)
+    if "type" not in data or not isinstance(data["type"], str):
+        raise ValueError("malformed cache entry")
+    module, _, qualname = data["type"].partition(":")
+    if not any(module == allowed or module.startswith(allowed + ".") for allowed in ALLOWED_MODULES):
+        raise ValueError(f"{data['type']} is not allowed in the cache")
+    cls = importlib.import_module(module)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    if not (isinstance(cls, type) and issubclass(cls, sp.Basic)):
+        raise ValueError(f"{data['type']} is not allowed in the cache")
+    return cls(*args)
+
+class SymbolicCache:
+    """Persistent content-addressed cache of SymPy results in an SQLite file.
+
+    Keys hash the operation name, the srepr of every argument and the SymPy
+    version, so a SymPy upgrade never serves stale results. Values are stored
+    as JSON from encode() and rebuilt by decode(), which never evaluates text,
+    so a planted cache file cannot run code. The database runs in WAL mode, so
+    several processes can read and write the same file. Entries beyond
+    `max_entries` or `max_bytes` are evicted least recently used first. Any
+    database or decoding error is treated as a miss, so a broken cache file
+    only costs recomputation.
+    """
+    def __init__(self, path: str = default_cache_path("symbolic_cache.sqlite"), max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, op TEXT, value TEXT, size INTEGER, last_used REAL)"
+        )
+        # Entries written by older versions were pickles; they are never loaded
+        self._conn.execute("DELETE FROM entries WHERE typeof(value) = 'blob'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    @staticmethod
+    def key(op: str, *args) -> str:
+        """Returns the content address of op(*args) under the installed SymPy version."""
+        import sympy as sp
+        text = "\0".join([sp.__version__, op] + [sp.srepr(arg) for arg in args])
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = decode(json.loads(row[0]))
+                    self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self.hits += 1
+                    return value
+            except (sqlite3.Error, ValueError, TypeError, KeyError, AttributeError, ImportError, RecursionError):
+                pass
+            self.misses += 1
+            return default
+
+    def put(self, key: str, op: str, value: Any):
+        try:
+            text = json.dumps(encode(value), separators=(",", ":"))
+        except (TypeError, ValueError, RecursionError):
+            return
+        if len(text) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                                       (key, op, text, len(text), time.time()))
+                    self._evict()
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error:
+                pass
+
+    def _evict(self):
+        """Deletes least recently used entries until both bounds hold; runs inside the put transaction."""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        self.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM entries")
+            except sqlite3.Error:
+                pass
+
+    def info(self) -> dict:
+        """Returns this process's hit/miss/eviction counters and the shared database's size."""
+        with self._lock:
+            try:
+                size, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            except sqlite3.Error:
+                size, total = 0, 0
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": size,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from engine import CalculatorEngine
+
+EQUATIONS = ["x^2 = 2", "x^3 - x = 0", "2x + 1 = 4"]
+
+@pytest.mark.parametrize("exact_roots", [False, True])
+def test_parallel_solve_matches_serial(exact_roots):
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None,
+                              exact_roots=exact_roots)
+    serial = engine.solve_many(EQUATIONS, max_workers=1)
+    parallel = engine.solve_many(EQUATIONS, max_workers=2)
+    assert [list(map(str, r)) for r in parallel] == [list(map(str, r)) for r in serial]
+    if exact_roots:
+        assert "sqrt(2)" in str(parallel[0])
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_reports_progress(max_workers):
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+    updates = []
+    engine.solve_many(EQUATIONS, max_workers=max_workers, progress=lambda done, total: updates.append((done, total)))
+    assert updates == [(1, 3), (2, 3), (3, 3)]
+
+def test_progress_callback_stops_analysis():
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+    updates = []
+
+    def stop_after_first(done, total):
+        updates.append((done, total))
+        raise RuntimeError("cancelled")
+
+    result = engine.analyze_function("x^2 - 1", fields=("roots", "derivative", "bref"), progress=stop_after_first)
+    assert updates == [(1, 3)]
+    assert result == {"error": "cancelled"}
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_caller_executor_uses_engine_settings(executor_type, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None, exact_roots=True)
+    serial = engine.solve_many(EQUATIONS, max_workers=1)
+    with executor_type(max_workers=2) as executor:
+        parallel = engine.solve_many(EQUATIONS, executor=executor)
+    assert [list(map(str, r)) for r in parallel] == [list(map(str, r)) for r in serial]
+    assert "sqrt(2)" in str(parallel[0])
+    assert list(tmp_path.iterdir()) == []
+
+def test_thread_executor_history_is_per_call():
+    engine = CalculatorEngine(history_file=None, symbolic_cache_file=None)
+    expressions = [f"{i} + 1" for i in range(400)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = engine.evaluate_many(expressions, executor=executor, chunksize=1)
+    assert results == [i + 1 for i in range(400)]
+    assert sorted(entry["expression"] for entry in engine.history) == sorted(expressions)
@@ -0,0 +1,14 @@
+import os
+import re
+import engine
+from build_app import build_command
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_every_lazy_module_is_a_hidden_import():
+    with open(os.path.join(ROOT, "engine.py"), encoding="utf-8") as f:
+        lazy = set(re.findall(r'lazy_import\("([\w.]+)"\)', f.read()))
+    assert lazy and lazy <= set(engine.LAZY_MODULES)
+    assert set(engine.PREWARM_MODULES) <= set(engine.LAZY_MODULES)
+    hidden = {arg.split("=", 1)[1] for arg in build_command() if arg.startswith("--hidden-import=")}
+    assert hidden == set(engine.LAZY_MODULES)
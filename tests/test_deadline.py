@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from deadline import DeadlinePool, SymbolicCancelled, SymbolicTimeout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_overrun_is_killed():
+    pool = DeadlinePool()
+    with pytest.raises(SymbolicTimeout):
+        pool.call(time.sleep, (5,), 0.5)
+    assert pool.call(pow, (2, 10), 5.0) == 1024
+    pool.shutdown()
+
+def test_cancel_kills_the_call_in_flight():
+    pool = DeadlinePool()
+    outcome = {}
+    started = threading.Event()
+
+    def job():
+        with pool.cancellable() as cancel:
+            outcome["cancel"] = cancel
+            started.set()
+            start = time.perf_counter()
+            try:
+                pool.call(time.sleep, (30,), 60.0)
+            except SymbolicCancelled:
+                outcome["seconds"] = time.perf_counter() - start
+            try:
+                pool.call(pow, (2, 3), 5.0)
+            except SymbolicCancelled:
+                outcome["later_call_cancelled"] = True
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    started.wait()
+    time.sleep(1.0)
+    outcome["cancel"]()
+    thread.join(20)
+    assert outcome["seconds"] < 10
+    assert outcome["later_call_cancelled"]
+    # The scope is closed, so this thread and later scopes are unaffected
+    outcome["cancel"]()
+    assert pool.call(pow, (2, 10), 5.0) == 1024
+    with pool.cancellable():
+        assert pool.call(pow, (2, 5), 5.0) == 32
+    pool.shutdown()
+
+def test_failed_start_falls_back_inline():
+    pool = DeadlinePool(preload=("no_such_module_for_deadline_test",), start_timeout=10.0)
+    assert pool.call(pow, (2, 3), 1.0) == 8
+    assert pool.start_error is not None
+    assert pool.call(pow, (3, 2), 1.0) == 9
+
+@pytest.mark.parametrize("method", ["default", "spawn"])
+def test_script_without_main_guard(tmp_path, method):
+    context = "None" if method == "default" else "multiprocessing.get_context('spawn')"
+    script = tmp_path / "unguarded.py"
+    script.write_text(
+        "import multiprocessing, sys\n"
+        f"sys.path.insert(0, {ROOT!r})\n"
+        "from deadline import DeadlinePool\n"
+        "from engine import CalculatorEngine\n"
+        "engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)\n"
+        f"engine.deadline_pool = DeadlinePool(preload=('sympy',), context={context})\n"
+        "print('RESULT', engine.solve_equation('x*y = 1'))\n")
+    proc = subprocess.run([sys.executable, str(script)], cwd=tmp_path, capture_output=True, text=True, timeout=120)
+    results = [line for line in proc.stdout.splitlines() if line.startswith("RESULT")]
+    assert results and all("Error" not in line for line in results), proc.stdout + proc.stderr
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from engine import OCR_CACHE_ENTRIES, CalculatorEngine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _isolated_env(tmp_path) -> dict:
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "cache"))
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def test_cli_leaves_no_files(tmp_path):
+    work = tmp_path / "work"
+    work.mkdir()
+    proc = subprocess.run([sys.executable, os.path.join(ROOT, "cli.py"), "--quiet"], input="2+2\n", cwd=work,
+                          env=_isolated_env(tmp_path), capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert '"result": 4' in proc.stdout
+    assert os.listdir(work) == []
+    assert not (tmp_path / "cache").exists()
+
+def test_caches_open_on_first_use(tmp_path):
+    engine = CalculatorEngine(record_history=False, history_file=None,
+                              symbolic_cache_file=str(tmp_path / "symbolic.sqlite"),
+                              hint_cache_file=str(tmp_path / "hint.sqlite"), ocr_cache_file=str(tmp_path / "ocr.sqlite"))
+    assert engine.evaluate_expression("2+2") == 4
+    assert os.listdir(tmp_path) == []
+    assert engine.ocr_cache.max_entries == OCR_CACHE_ENTRIES
+    assert os.path.exists(tmp_path / "ocr.sqlite")
+    assert not os.path.exists(tmp_path / "hint.sqlite")
+
+def test_disabled_caches_stay_none(tmp_path):
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None,
+                              hint_cache_file=None, ocr_cache_file=None)
+    assert engine.hint_cache is None and engine.ocr_cache is None and engine.symbolic_cache is None
+    assert engine.hint_cache_info() is None
@@ -0,0 +1,42 @@
+import math
+import pytest
+from engine import CalculatorEngine
+
+# Every entry must give the same answer on the fast and SymPy tiers
+DIFFERENTIAL_CORPUS = [
+    '2*4', '2^3', '5²', '1/3', '0.1+0.2', '7//2', '-7%3', '7.5//2', '-2^2', '2^-1',
+    '2^0.5', '(1+2)*(3-4)/5', '2^100', '3^1000/3^999',
+    'sin(pi/2)', 'sin(pi)', 'cos(pi/2)', 'cos(pi)', 'tan(pi/4)', 'tan(pi/3)', 'sin(-pi/6)',
+    'sin(1)', 'cos(2.5)', 'tan(0.3)', 'asin(1)', 'acos(0.5)', 'atan(1)',
+    'sin(10^15)', 'sin(123456789012)', 'sin(2^60)', 'cos(10^15)', 'tan(10^15)', 'sin(1000π)', 'cos(99999π/3)',
+    'sqrt(16)', 'sqrt(2)', '√(9)', 'log(1)', 'log(e)', 'log(10)', 'exp(0)', 'exp(1)', 'abs(-3)', 'abs(-2.5)',
+    'π', 'e', '2π', '2(3+4)', 'sin(pi/2', '6÷4×2',
+    '5 != 3', '5 > 3', '3 <= 2', '1 < 2 < 3', '2 == 2', '4/2 == 2', 'sqrt(4) == 2',
+    '1/2 == 0.5', '2^-1 == 0.5', 'sin(pi/6) == 0.5', '3/2 != 1.5', '0.5 == 0.5', 'sqrt(2)^2 > 2',
+    '1/3 < 0.34', '2.5 > 2',
+    'sqrt(-1)', 'log(0)', '1/0', 'tan(pi/2)', 'asin(2)', '(-8)^(1/3)', '2^2000', 'x + 1'
+]
+
+def same_result(fast, slow) -> bool:
+    if isinstance(fast, str) or isinstance(slow, str) or isinstance(fast, bool) or isinstance(slow, bool):
+        return fast == slow
+    return math.isclose(fast, slow, rel_tol=1e-12, abs_tol=1e-15)
+
+@pytest.fixture(scope="module")
+def engines():
+    def make(fast_path):
+        return CalculatorEngine(fast_path=fast_path, record_history=False, history_file=None,
+                                symbolic_cache_file=None)
+    return make(True), make(False)
+
+@pytest.mark.parametrize("expression", DIFFERENTIAL_CORPUS)
+def test_fast_path_matches_sympy(engines, expression):
+    fast_engine, sympy_engine = engines
+    fast = fast_engine.evaluate_expression(expression)
+    slow = sympy_engine.evaluate_expression(expression)
+    assert same_result(fast, slow), f"{expression!r}: fast {fast!r} ({fast_engine.last_eval_tier}) vs sympy {slow!r}"
+
+def test_fast_path_is_used_for_plain_arithmetic(engines):
+    fast_engine, _ = engines
+    fast_engine.evaluate_expression("2 == 2")
+    assert fast_engine.last_eval_tier == "fast"
@@ -0,0 +1,49 @@
+import random
+import pytest
+from history_store import HistoryStore
+
+def _entries(count: int) -> list:
+    rng = random.Random(0)
+    entries = []
+    for i in range(count):
+        # Mostly increasing times with some clock jumps and entries without a time
+        entry = {"type": rng.choice(["Eval", "Solve"]), "expression": f"x^{i % 7} + {i}", "result": i}
+        if i % 13:
+            entry["time"] = 1000.0 + i + (rng.uniform(-30, 0) if i % 5 == 0 else 0)
+        entries.append(entry)
+    return entries
+
+def _brute_force(entries, since=None, until=None, types=None):
+    matches = []
+    for entry in reversed(entries):
+        moment = entry.get("time")
+        if since is not None or until is not None:
+            if moment is None or (since is not None and moment < since) or (until is not None and moment > until):
+                continue
+        if types is not None and entry["type"] not in types:
+            continue
+        matches.append(entry)
+    return matches
+
+def _all_pages(store, **filters):
+    items, cursor = [], None
+    while True:
+        page = store.query(cursor=cursor, limit=7, **filters)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+@pytest.mark.parametrize("filters", [{"since": 1100}, {"until": 1050.5}, {"since": 1020, "until": 1080},
+                                     {"since": 1020, "until": 1080, "types": {"Solve"}}, {"since": 5000}])
+def test_time_range_matches_scan(filters):
+    entries = _entries(200)
+    store = HistoryStore(None, limit=150)
+    store.extend(entries)
+    assert _all_pages(store, **filters) == _brute_force(entries[-150:], **filters)
+
+def test_evicted_entries_leave_the_time_index():
+    store = HistoryStore(None, limit=10)
+    store.extend({"type": "Eval", "expression": str(i), "time": float(i)} for i in range(25))
+    assert [seq for _, seq in store.index.by_time] == list(range(15, 25))
+    assert [e["time"] for e in store.query(until=17)["items"]] == [17.0, 16.0, 15.0]
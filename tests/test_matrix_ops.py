@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import matrix_ops
+from engine import CalculatorEngine
+
+rng = np.random.default_rng(0)
+N = 40
+STACK = (3,)
+
+def _band(lower: int, upper: int, n: int = N, stack=STACK) -> np.ndarray:
+    a = rng.standard_normal(stack + (n, n))
+    rows, cols = np.indices((n, n))
+    return np.where((rows - cols <= lower) & (cols - rows <= upper), a, 0.0)
+
+def _matrices() -> dict:
+    diagonal = _band(0, 0) + 3 * np.eye(N)
+    upper = _band(0, N) + N * np.eye(N)
+    lower = _band(N, 0) + N * np.eye(N)
+    general = rng.standard_normal(STACK + (N, N))
+    hermitian = general + rng.standard_normal(STACK + (N, N)) * 1j
+    hermitian = hermitian + np.conj(np.swapaxes(hermitian, -1, -2)) + 4 * N * np.eye(N)
+    # A zero main diagonal forces the banded elimination to pivot on every column
+    banded = _band(2, 3) * (1 - np.eye(N)) + np.eye(N, k=1) + np.eye(N, k=-1)
+    return {"diagonal": diagonal, "upper": upper, "lower": lower, "hermitian": hermitian,
+            "banded": banded, "general": general}
+
+MATRICES = _matrices()
+
+@pytest.fixture
+def small_banded(monkeypatch):
+    monkeypatch.setattr(matrix_ops, "BANDED_MIN_SIZE", N)
+    monkeypatch.setattr(matrix_ops, "BANDED_MAX_FRACTION", 0.5)
+
+@pytest.mark.parametrize("name", list(MATRICES))
+def test_detect_structure(small_banded, name):
+    assert matrix_ops.detect_structure(MATRICES[name])[0] == name
+
+@pytest.mark.parametrize("name", list(MATRICES))
+def test_structure_paths_match_linalg(small_banded, name):
+    a = MATRICES[name]
+    b = rng.standard_normal(STACK + (N, 2))
+    vector = rng.standard_normal(STACK + (N,))
+    assert np.allclose(matrix_ops.solve(a, b), np.linalg.solve(a, b))
+    assert np.allclose(matrix_ops.solve(a, vector), np.linalg.solve(a, vector[..., None])[..., 0])
+    assert np.allclose(matrix_ops.inv(a), np.linalg.inv(a))
+    assert np.allclose(matrix_ops.det(a), np.linalg.det(a))
+    values, vectors = matrix_ops.eig(a)
+    assert np.allclose(a @ vectors, vectors * values[..., None, :])
+    assert np.allclose(matrix_ops.multiply(a, b), a @ b)
+
+def test_banded_solve_pivots_within_the_band():
+    a = MATRICES["banded"][0]
+    assert np.all(np.diagonal(a) == 0)
+    b = rng.standard_normal((N, 3))
+    assert np.allclose(matrix_ops.banded_solve(a, b, 2, 3), np.linalg.solve(a, b))
+
+@pytest.mark.parametrize("lower", [True, False])
+def test_triangular_solve_across_blocks(lower):
+    n = 150
+    a = np.tril(rng.standard_normal((2, n, n))) + n * np.eye(n)
+    if not lower:
+        a = np.swapaxes(a, -1, -2)
+    b = rng.standard_normal((2, n, 4))
+    assert np.allclose(matrix_ops.triangular_solve(a, b, lower, block=32), np.linalg.solve(a, b))
+
+def test_singular_structures_raise():
+    a = np.diag([1.0, 0.0, 2.0])
+    with pytest.raises(np.linalg.LinAlgError):
+        matrix_ops.solve(a, np.ones(3))
+    with pytest.raises(np.linalg.LinAlgError):
+        matrix_ops.triangular_solve(np.triu(np.ones((3, 3))) - np.eye(3), np.ones((3, 1)), lower=False)
+
+@pytest.mark.parametrize("structure", matrix_ops.STRUCTURES)
+def test_structure_override_matches_linalg(structure):
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+    # Triangular and diagonal overrides are only valid for matrices that have that shape
+    a = {"diagonal": MATRICES["diagonal"], "upper": MATRICES["upper"], "lower": MATRICES["lower"],
+         "hermitian": MATRICES["hermitian"]}.get(structure, MATRICES["banded"])
+    b = rng.standard_normal(STACK + (N, 2))
+    assert np.allclose(engine.matrix_operations("solve", a, b, structure=structure), np.linalg.solve(a, b))
+    assert np.allclose(engine.matrix_operations("inv", a, structure=structure), np.linalg.inv(a))
+    assert np.allclose(engine.matrix_operations("det", a, structure=structure), np.linalg.det(a))
+
+def test_unknown_structure_is_reported():
+    engine = CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+    assert engine.matrix_operations("det", np.eye(2), structure="sparse").startswith("Error")
@@ -0,0 +1,30 @@
+import math
+import time
+import numpy as np
+from engine import CalculatorEngine
+from quadrature import gauss_kronrod
+
+def make_engine():
+    return CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+
+def test_finite_integral_converges():
+    value, error = gauss_kronrod(np.sin, 0.0, math.pi)
+    assert abs(value - 2.0) < 1e-12 and error < 1e-8
+
+def test_oscillatory_infinite_integral_terminates():
+    start = time.perf_counter()
+    result = make_engine().definite_integral('sin(x)/x', (0, float('inf')))
+    assert time.perf_counter() - start < 10
+    assert math.isfinite(result["value"])
+    # The slowly decaying tail is not resolved, but the estimate must say so
+    assert result["error"] >= abs(result["value"] - math.pi / 2)
+
+def test_divergent_infinite_integral_terminates():
+    start = time.perf_counter()
+    result = make_engine().definite_integral('sin(x)', (0, float('inf')))
+    assert time.perf_counter() - start < 10
+    assert not result["error"] <= 1e-8
+
+def test_collapsed_intervals_do_not_spin():
+    value, error = gauss_kronrod(lambda t: np.full_like(t, np.nan), 0.0, 1.0)
+    assert error == math.inf
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from engine import CalculatorEngine
+from roots import polynomial_roots, real_roots
+
+@pytest.fixture(scope="module")
+def engine():
+    return CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None,
+                            hint_cache_file=None, ocr_cache_file=None)
+
+def test_identity_has_no_isolated_roots(engine):
+    assert list(engine.solve_equation('sin(x)^2 + cos(x)^2 = 1', numeric=True)) == []
+
+def test_zero_interval_is_one_root(engine):
+    assert list(engine.solve_equation('floor(x) = 0', numeric=True)) == [0.0]
+
+def test_flat_multiple_root_is_reported_once():
+    assert real_roots(lambda x: x ** 10, -10, 10) == [0.0]
+
+def test_isolated_roots_are_unchanged():
+    found = real_roots(np.sin, -10, 10)
+    assert np.allclose(found, np.pi * np.arange(-3, 4))
+
+@pytest.mark.parametrize("coeffs", [[1, 0, 1e-20], [1e20, 0, 1]])
+def test_tiny_complex_roots_stay_complex(coeffs):
+    found = polynomial_roots(coeffs)
+    assert [multiplicity for _, multiplicity in found] == [1, 1]
+    assert all(isinstance(root, complex) and root.real == 0 for root, _ in found)
+    assert np.allclose(sorted(abs(root) for root, _ in found), [1e-10, 1e-10], rtol=1e-6)
+
+def test_tiny_real_roots_stay_real():
+    found = polynomial_roots([1, 0, -1e-20])
+    assert all(isinstance(root, float) for root, _ in found)
+    assert np.allclose([root for root, _ in found], [-1e-10, 1e-10], rtol=1e-6)
+
+def test_solve_reports_tiny_complex_roots(engine):
+    solutions = engine.solve_equation('x^2 + 1e-20 = 0')
+    assert len(solutions) == 2 and all(isinstance(root, complex) for root in solutions)
@@ -0,0 +1,36 @@
+import pytest
+import sympy as sp
+from engine import CalculatorEngine
+
+x1, x2, x3 = sp.symbols('x1 x2 x3')
+
+@pytest.fixture(scope="module")
+def engine():
+    return CalculatorEngine(record_history=False, history_file=None, symbolic_cache_file=None)
+
+def test_subscripted_names_exact(engine):
+    solutions = engine.solve_system(["x1 + x2 = 3", "x1 - x2 = 1"], exact=True)
+    assert list(solutions) == [{x1: 2, x2: 1}]
+    assert solutions.rank == 2
+
+def test_subscripted_names_numeric(engine):
+    solutions = engine.solve_system("x1 + x2 = 3; x1 - x2 = 1")
+    assert solutions.rank == 2
+    assert float(solutions[0][x1]) == pytest.approx(2) and float(solutions[0][x2]) == pytest.approx(1)
+
+def test_subscripted_names_underdetermined(engine):
+    solutions = engine.solve_system(["x1 + x2 + x3 = 3", "x1 - x2 = 1"], exact=True)
+    assert solutions.rank == 2 and solutions.free_variables == [x3]
+    assert sp.simplify(solutions[0][x1] - (2 - x3 / 2)) == 0
+
+def test_many_subscripted_unknowns(engine):
+    # x1 = 1 and x(i+1) - x(i) = 1, so xi = i
+    n = 120
+    equations = ["x1 = 1"] + [f"x{i + 1} - x{i} = 1" for i in range(1, n)]
+    solution = engine.solve_system(equations)[0]
+    assert len(solution) == n
+    assert all(float(solution[sp.Symbol(f"x{i}")]) == pytest.approx(i) for i in range(1, n + 1))
+
+def test_implicit_products_still_split(engine):
+    assert [str(root) for root in engine.solve_equation("2x1 = 4")] == ["2.0"]
+    assert sp.Symbol('xy') not in engine._parse_equation("xy = 2")[1].free_symbols
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from sparse_matrix import COOMatrix, CSRMatrix, as_csr, conjugate_gradient, gmres
+
+rng = np.random.default_rng(0)
+N = 60
+
+def _sparse_dense(shape, density=0.1, complex_values=False) -> np.ndarray:
+    dense = rng.standard_normal(shape)
+    if complex_values:
+        dense = dense + 1j * rng.standard_normal(shape)
+    return np.where(rng.random(shape) < density, dense, 0)
+
+@pytest.fixture(params=[False, True], ids=["real", "complex"])
+def complex_values(request):
+    return request.param
+
+def test_from_dense_round_trip(complex_values):
+    dense = _sparse_dense((N, N + 5), complex_values=complex_values)
+    a = CSRMatrix.from_dense(dense)
+    assert a.nnz == np.count_nonzero(dense)
+    assert np.array_equal(a.toarray(), dense)
+    assert np.array_equal(a.T.toarray(), dense.T)
+    assert np.array_equal(a.diagonal(), np.diagonal(dense))
+
+def test_tocsr_sums_duplicates():
+    rows = [0, 2, 0, 1, 2, 0, 1]
+    cols = [1, 0, 1, 2, 0, 1, 2]
+    data = [1.0, 2.0, 3.0, 4.0, -2.0, 0.5, 1.5]
+    expected = np.zeros((3, 3))
+    np.add.at(expected, (rows, cols), data)
+    a = COOMatrix(rows, cols, data, (3, 3)).tocsr()
+    assert np.array_equal(a.toarray(), expected)
+    # (2, 0) cancels to zero and is dropped rather than stored
+    assert a.nnz == 2
+    assert list(a.indptr) == [0, 1, 2, 2]
+
+def test_empty_matrix():
+    a = COOMatrix([], [], [], (3, 4)).tocsr()
+    assert a.nnz == 0
+    assert np.array_equal(a @ np.ones(4), np.zeros(3))
+    assert np.array_equal(a.toarray(), np.zeros((3, 4)))
+
+def test_matvec_and_dense_product(complex_values):
+    dense = _sparse_dense((N, N + 5), complex_values=complex_values)
+    # Leave a few rows empty so the reduceat path has gaps
+    dense[[3, 17, N - 1]] = 0
+    a = as_csr(dense)
+    x = rng.standard_normal(N + 5)
+    m = rng.standard_normal((N + 5, 4))
+    assert np.allclose(a @ x, dense @ x)
+    assert np.allclose(a @ m, dense @ m)
+
+def test_sparse_product(complex_values):
+    left = _sparse_dense((N, N + 5), complex_values=complex_values)
+    right = _sparse_dense((N + 5, N - 5))
+    product = as_csr(left) @ as_csr(right)
+    assert isinstance(product, CSRMatrix)
+    assert np.allclose(product.toarray(), left @ right)
+    coo = as_csr(right).tocoo()
+    assert np.allclose((as_csr(left) @ coo).toarray(), left @ right)
+
+def test_rmatmul(complex_values):
+    dense = _sparse_dense((N, N + 5), complex_values=complex_values)
+    a = as_csr(dense)
+    x = rng.standard_normal(N)
+    m = rng.standard_normal((4, N))
+    assert np.allclose(x @ a, x @ dense)
+    assert np.allclose(m @ a, m @ dense)
+
+def test_add(complex_values):
+    left = _sparse_dense((N, N), complex_values=complex_values)
+    right = _sparse_dense((N, N))
+    total = as_csr(left) + as_csr(right)
+    assert isinstance(total, CSRMatrix)
+    assert np.allclose(total.toarray(), left + right)
+    # Adding the negation cancels every entry
+    assert (as_csr(left) + as_csr(-left)).nnz == 0
+    dense = rng.standard_normal((N, N))
+    assert np.allclose(as_csr(left) + dense, left + dense)
+    assert np.allclose(dense + as_csr(left), left + dense)
+    assert np.allclose(as_csr(left) + 1.5, left + 1.5)
+
+def test_shape_mismatch_raises():
+    a = as_csr(np.eye(3))
+    with pytest.raises(ValueError):
+        a @ np.ones(4)
+    with pytest.raises(ValueError):
+        a @ as_csr(np.eye(4))
+    with pytest.raises(ValueError):
+        a + as_csr(np.eye(4))
+
+def _spd(complex_values) -> np.ndarray:
+    # Sparse Hermitian matrix made positive definite by diagonal dominance
+    dense = _sparse_dense((N, N), density=0.05, complex_values=complex_values)
+    dense = dense + dense.conj().T
+    return dense + np.diag(np.abs(dense).sum(axis=1) + 1)
+
+def test_conjugate_gradient_converges(complex_values):
+    dense = _spd(complex_values)
+    b = rng.standard_normal(N) + (1j * rng.standard_normal(N) if complex_values else 0)
+    x, info = conjugate_gradient(as_csr(dense), b, tol=1e-12)
+    assert info["converged"] and info["iterations"] <= N
+    assert np.linalg.norm(dense @ x - b) <= 1e-10 * np.linalg.norm(b)
+    assert np.allclose(x, np.linalg.solve(dense, b))
+
+@pytest.mark.parametrize("restart", [N, 10])
+def test_gmres_converges(complex_values, restart):
+    # Nonsymmetric, so CG does not apply
+    dense = _sparse_dense((N, N), complex_values=complex_values) + 4 * np.eye(N)
+    b = rng.standard_normal(N) + (1j * rng.standard_normal(N) if complex_values else 0)
+    x, info = gmres(as_csr(dense), b, tol=1e-12, restart=restart)
+    assert info["converged"]
+    assert np.linalg.norm(dense @ x - b) <= 1e-10 * np.linalg.norm(b)
+    assert np.allclose(x, np.linalg.solve(dense, b))
+
+def test_gmres_zero_right_hand_side():
+    x, info = gmres(as_csr(np.eye(5) * 2), np.zeros(5))
+    assert info["converged"] and info["iterations"] == 0
+    assert np.array_equal(x, np.zeros(5))
+
+def test_solvers_report_non_convergence():
+    dense = _sparse_dense((N, N)) + 4 * np.eye(N)
+    _, info = gmres(as_csr(dense), np.ones(N), restart=5, max_iter=5)
+    assert not info["converged"] and info["iterations"] == 5
+    _, info = conjugate_gradient(as_csr(_spd(False)), np.ones(N), max_iter=1)
+    assert not info["converged"] and info["iterations"] == 1
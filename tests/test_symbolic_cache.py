@@ -0,0 +1,84 @@
+import json
+import os
+import pickle
+import sqlite3
+import pytest
+import sympy as sp
+import symbolic_cache
+from symbolic_cache import SymbolicCache, decode, encode
+
+x = sp.Symbol('x')
+f = sp.Function('f')
+
+ROUND_TRIP = [
+    sp.solve(x**2 - 2, x),
+    sp.solve(x**5 - x + 1, x),
+    sp.diff(sp.sin(x) * sp.exp(x), x),
+    sp.integrate(1 / (1 + x**2), x),
+    sp.Integral(sp.exp(-x**2) * sp.log(x), x),
+    sp.Float('1.2345678901234567890123', 30),
+    sp.I + sp.pi + sp.E,
+    [sp.oo, -sp.oo, sp.zoo, sp.nan],
+    sp.Piecewise((x, x > 0), (-x, True)),
+    sp.Derivative(f(x), x),
+    sp.Symbol('y', positive=True) ** 2,
+    sp.Dummy('d') + 1,
+    sp.erf(x) + sp.LambertW(x) + sp.Abs(x),
+    sp.Matrix([[1, x], [sp.Rational(1, 3), 2]]),
+    {x: sp.sqrt(2), "key": (1, 2.5, None, True)},
+    "Error: not cacheable as an expression",
+]
+
+@pytest.mark.parametrize("value", ROUND_TRIP, ids=range(len(ROUND_TRIP)))
+def test_round_trip(value):
+    restored = decode(json.loads(json.dumps(encode(value))))
+    assert restored == value
+    assert type(restored) is type(value)
+
+def test_dummy_identity_survives():
+    d = sp.Dummy('d', real=True)
+    assert decode(encode(d)) == d
+
+def test_string_arguments_are_rejected():
+    # sin("...") would sympify (and so eval) the string
+    entry = {"type": "sympy.functions.elementary.trigonometric:sin", "args": ["__import__('os')"]}
+    with pytest.raises(ValueError):
+        decode(entry)
+
+@pytest.mark.parametrize("name", ["os:system", "builtins:eval", "sympy.parsing.sympy_parser:parse_expr",
+                                  "sympy.core.sympify:sympify"])
+def test_types_outside_the_allowlist_are_rejected(name):
+    with pytest.raises(ValueError):
+        decode({"type": name, "args": []})
+
+def test_values_persist(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SymbolicCache(path)
+    key = cache.key("solve", x**2 - 2, x)
+    cache.put(key, "solve", sp.solve(x**2 - 2, x))
+    cache.close()
+    cache = SymbolicCache(path)
+    assert cache.get(key) == [-sp.sqrt(2), sp.sqrt(2)]
+    cache.close()
+
+def test_legacy_pickle_is_never_loaded(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    marker = tmp_path / "pwned"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, op TEXT, value BLOB, size INTEGER, last_used REAL)")
+    blob = pickle.dumps(type("Exploit", (), {"__reduce__": lambda self: (open, (str(marker), "w"))})())
+    conn.execute("INSERT INTO entries VALUES ('k', 'solve', ?, ?, 0)", (blob, len(blob)))
+    conn.commit()
+    conn.close()
+    cache = SymbolicCache(path)
+    assert cache.get("k") is None
+    assert not marker.exists()
+    cache.close()
+
+def test_default_path_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setattr(symbolic_cache.sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert symbolic_cache.default_cache_path("a.sqlite") == os.path.join(str(tmp_path), "sao-calculator", "a.sqlite")
+    cache = SymbolicCache(symbolic_cache.default_cache_path("a.sqlite"))
+    assert os.path.exists(os.path.join(str(tmp_path), "sao-calculator", "a.sqlite"))
+    cache.close()